@@ -1,15 +1,81 @@
+import time
+_startup_clock = time.perf_counter()
+
 from dotenv import load_dotenv
 load_dotenv()
 
+import argparse
+import asyncio
 import requests
-from datetime import datetime
+import urllib3
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta
+import calendar
+import codecs
+import contextvars
+import functools
+import hashlib
+import io
+import json
 import os
 import logging
+import sqlite3
+import random
+import re
+import signal
+import threading
+from contextlib import closing, contextmanager
+from email.utils import parsedate_to_datetime
+
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Pillow is imported on first render (see _import_pil), so runs without a
+# postcard never pay for it. Process pools, mimetypes and zoneinfo are also
+# imported only where they are used.
+Image = ImageDraw = ImageFont = None
+
+# Startup/initialization steps and their durations, for --startup-report
+STARTUP_TIMINGS = [("imports (dotenv, requests, stdlib)", time.perf_counter() - _startup_clock)]
+
+
+@contextmanager
+def _timed_init(step):
+    """Record how long a one-time initialization step takes."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.append((step, time.perf_counter() - started))
+
 
-import mimetypes
-from collections import defaultdict
+def _import_pil():
+    """Import Pillow on first use."""
+    global Image, ImageDraw, ImageFont
+    if Image is None:
+        with _timed_init("import PIL"):
+            from PIL import Image, ImageDraw, ImageFont
 
-from PIL import Image, ImageDraw, ImageFont
+
+def print_startup_report():
+    """Print init step timings plus total CPU time and peak memory of this process."""
+    import resource
+    
+    print("\n" + "=" * 60)
+    print("STARTUP REPORT")
+    print("=" * 60)
+    totals = {}
+    for step, seconds in STARTUP_TIMINGS:
+        total, count = totals.get(step, (0.0, 0))
+        totals[step] = (total + seconds, count + 1)
+    for step, (seconds, count) in totals.items():
+        suffix = f" (x{count})" if count > 1 else ""
+        print(f"  {seconds * 1000:9.1f} ms  {step}{suffix}")
+    print("-" * 60)
+    print(f"  Wall time since start: {(time.perf_counter() - _startup_clock) * 1000:.1f} ms")
+    print(f"  CPU time:              {time.process_time() * 1000:.1f} ms")
+    # ru_maxrss is reported in kilobytes on Linux
+    print(f"  Peak memory (RSS):     {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
 
 # Configuration
 PLANNING_CENTER_APP_ID = os.getenv('PC_APP_ID')
@@ -18,12 +84,99 @@ WHATSAPP_API_TOKEN = os.getenv('WHATSAPP_API_TOKEN')
 WHATSAPP_PHONE_NUMBER_ID = os.getenv('WHATSAPP_PHONE_NUMBER_ID')
 TARGET_PHONE_NUMBER = os.getenv('TARGET_PHONE_NUMBER')
 
+# Recipients of the daily postcard (comma-separated, empty means
+# TARGET_PHONE_NUMBER); notifications still go to TARGET_PHONE_NUMBER only
+WHATSAPP_RECIPIENTS = [n.strip() for n in (os.getenv('WHATSAPP_RECIPIENTS') or TARGET_PHONE_NUMBER or '').split(',') if n.strip()]
+
+# WhatsApp send throughput for the postcard fan-out (match your Business tier)
+WA_MESSAGES_PER_SECOND = max(1, int(os.getenv('WA_MESSAGES_PER_SECOND', '20')))
+WA_MAX_CONCURRENCY = max(1, int(os.getenv('WA_MAX_CONCURRENCY', '8')))
+
+# API base URLs (override to point the bot at local stand-ins, e.g. benchmarks/fake_servers.py)
+PC_BASE_URL = os.getenv('PC_BASE_URL', 'https://api.planningcenteronline.com/people/v2').rstrip('/')
+WHATSAPP_GRAPH_URL = os.getenv('WHATSAPP_GRAPH_URL', 'https://graph.facebook.com/v21.0').rstrip('/')
+
+# Maximum number of concurrent Planning Center requests (keep well under the
+# API rate limit of 100 requests per 20 seconds)
+PC_MAX_CONCURRENCY = max(1, int(os.getenv('PC_MAX_CONCURRENCY', '4')))
+
+# Page size for Planning Center collection requests (API maximum is 100)
+PC_PAGE_SIZE = 100
+
+# Parse collection pages incrementally as they download instead of all at once
+# (keeps memory flat for very large lists; bypasses the HTTP cache)
+PC_STREAM_JSON = os.getenv('PC_STREAM_JSON', '').lower() in ('1', 'true', 'yes')
+
+# Planning Center list holding everyone with a wedding anniversary
+PC_ANNIVERSARY_LIST_ID = os.getenv('PC_ANNIVERSARY_LIST_ID', '4700166')
+
+# HTTP retry policy for transient failures (429 / 5xx / connection errors)
+HTTP_MAX_RETRIES = max(0, int(os.getenv('HTTP_MAX_RETRIES', '4')))
+HTTP_BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', '1.0'))  # seconds, doubled per attempt
+HTTP_BACKOFF_MAX = 60  # seconds, also caps Retry-After
+
+# Planning Center allows 100 requests per 20 seconds; refined from response headers
+PC_RATE_LIMIT = 100
+PC_RATE_PERIOD = 20
+
+# Local SQLite cache of people/households and uploaded media (mount ./data as a volume to persist)
+CACHE_DB_PATH = os.getenv('CACHE_DB_PATH', 'data/cache.db')
+PEOPLE_CACHE_ENABLED = os.getenv('PEOPLE_CACHE_ENABLED', '').lower() in ('1', 'true', 'yes')
+# Incremental syncs never see deletions, so list everyone again this often
+PEOPLE_CACHE_RECONCILE_DAYS = int(os.getenv('PEOPLE_CACHE_RECONCILE_DAYS', '7'))
+
+# Journal each day's postcard run and every send, so a restarted run resumes
+# where it stopped instead of rendering, uploading or sending again
+OUTBOX_ENABLED = os.getenv('OUTBOX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+OUTBOX_MAX_ATTEMPTS = max(1, int(os.getenv('OUTBOX_MAX_ATTEMPTS', '3')))  # per message and run
+OUTBOX_KEEP_DAYS = 60
+
+# Revalidate Planning Center GETs with ETag/Last-Modified instead of re-downloading them
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+HTTP_CACHE_DAYS = 30  # Forget responses not seen for this long (date-filtered URLs only repeat yearly)
+HTTP_CACHE_MEMORY_ENTRIES = 32  # Decoded pages kept in memory; older ones are re-read from the database
+
+# WhatsApp keeps uploaded media for 30 days; reuse media IDs a bit less than that
+WA_MEDIA_CACHE_DAYS = float(os.getenv('WA_MEDIA_CACHE_DAYS', '29'))
+
 # Paths
 FONT_REGULAR_PATH = "fonts/Lora-Regular.ttf"
 FONT_BOLD_PATH = "fonts/Lora-Bold.ttf"
 TEMPLATE_DIR = "postcard"
 TEXT_COLOR = "#9c8b6a"  # Refined gold/tan for names and date
 SECTION_HEADER_COLOR = "#756a54"  # Darker brown for section headers (Cumpleaños, Aniversario)
+MIN_FONT_SIZE = int(os.getenv('POSTCARD_MIN_FONT_SIZE', '20'))  # Smaller than this, names move to more columns/pages
+POSTCARD_MAX_COLUMNS = 2  # Columns per page before names flow onto another page
+POSTCARD_OUTPUT_PATH = os.getenv('POSTCARD_OUTPUT_PATH')  # Optional copy of the postcard for inspection
+# JPEG encoding: the highest quality that fits the byte budget (0 = always POSTCARD_MAX_QUALITY)
+POSTCARD_MAX_BYTES = int(os.getenv('POSTCARD_MAX_BYTES', '250000'))
+POSTCARD_MIN_QUALITY = int(os.getenv('POSTCARD_MIN_QUALITY', '60'))
+POSTCARD_MAX_QUALITY = int(os.getenv('POSTCARD_MAX_QUALITY', '85'))
+POSTCARD_MAX_WIDTH = int(os.getenv('POSTCARD_MAX_WIDTH', '0'))  # Downscale wider templates (0 = native)
+POSTCARD_PROGRESSIVE = os.getenv('POSTCARD_PROGRESSIVE', '').lower() in ('1', 'true', 'yes')
+PRERENDER_DIR = os.getenv('PRERENDER_DIR', 'data/prerender')  # Postcards rendered ahead of time (--prerender)
+# Render processes for --render-range/--prerender. os.cpu_count() reports the
+# host's cores, not a container's CPU limit, so the default stays small
+RENDER_WORKERS = max(1, int(os.getenv('RENDER_WORKERS', '2')))
+POSTCARD_RENDER_VERSION = 4  # Bump when layout or encoding changes to invalidate pre-rendered postcards
+
+# Machine-readable run report (JSON) and Prometheus textfile-collector output; empty disables
+RUN_REPORT_PATH = os.getenv('RUN_REPORT_PATH', '')
+PROMETHEUS_TEXTFILE_PATH = os.getenv('PROMETHEUS_TEXTFILE_PATH', '')
+
+# Per-stage cProfile/tracemalloc output (--profile or BIRTHDAY_PROFILE=1)
+PROFILE_ENABLED = os.getenv('BIRTHDAY_PROFILE', '').lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'output/profile')
+
+# Daemon schedules ("HH:MM" daily or "MON HH:MM" weekly, in the TZ timezone; empty disables)
+SCHEDULE_DAILY_CARD = os.getenv('SCHEDULE_DAILY_CARD', '08:00')
+SCHEDULE_WEEKLY_DIGEST = os.getenv('SCHEDULE_WEEKLY_DIGEST', '')
+SCHEDULE_PRERENDER = os.getenv('SCHEDULE_PRERENDER', '')
+PRERENDER_DAYS = max(1, int(os.getenv('PRERENDER_DAYS', '2')))
+
+# Multi-tenant mode: JSON file describing several congregations run by one process
+TENANTS_CONFIG = os.getenv('TENANTS_CONFIG', '')
+TENANT_CONCURRENCY = max(1, int(os.getenv('TENANT_CONCURRENCY', '4')))
 
 # WhatsApp Message Template Names (must be approved in Meta Business Suite)
 WA_TEMPLATE_CONGRATULATION = "congratulation_msg"  # Template with image header and count parameters
@@ -36,28 +189,502 @@ MONTHS_ES = {
     9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
 }
 
-def send_whatsapp_template(template_name, parameters=None, media_id=None):
+# =============================================================================
+# TENANT CONTEXT
+# =============================================================================
+
+# Tenant being processed by the current thread/task (None outside multi-tenant mode)
+_current_tenant = contextvars.ContextVar('tenant', default=None)
+
+
+def default_settings():
+    """Return the environment's value of every setting a tenant can override."""
+    return {
+        'PLANNING_CENTER_APP_ID': PLANNING_CENTER_APP_ID,
+        'PLANNING_CENTER_SECRET': PLANNING_CENTER_SECRET,
+        'PC_BASE_URL': PC_BASE_URL,
+        'PC_ANNIVERSARY_LIST_ID': PC_ANNIVERSARY_LIST_ID,
+        'WHATSAPP_API_TOKEN': WHATSAPP_API_TOKEN,
+        'WHATSAPP_PHONE_NUMBER_ID': WHATSAPP_PHONE_NUMBER_ID,
+        'TARGET_PHONE_NUMBER': TARGET_PHONE_NUMBER,
+        'WHATSAPP_RECIPIENTS': WHATSAPP_RECIPIENTS,
+        'PEOPLE_CACHE_ENABLED': PEOPLE_CACHE_ENABLED,
+        'CACHE_DB_PATH': CACHE_DB_PATH,
+        'PRERENDER_DIR': PRERENDER_DIR,
+        'POSTCARD_OUTPUT_PATH': POSTCARD_OUTPUT_PATH,
+        'RUN_REPORT_PATH': RUN_REPORT_PATH,
+        'PROMETHEUS_TEXTFILE_PATH': PROMETHEUS_TEXTFILE_PATH,
+    }
+
+
+def setting(name):
+    """Return a per-tenant setting for the tenant being processed.
+    
+    Outside multi-tenant mode (or for settings a tenant does not override)
+    this is the environment's value from default_settings().
+    """
+    tenant = _current_tenant.get()
+    if tenant is not None and name in tenant.settings:
+        return tenant.settings[name]
+    return default_settings()[name]
+
+
+def _in_context(func):
+    """Wrap func so worker threads run it with the caller's tenant context."""
+    context = contextvars.copy_context()
+    
+    def _run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(func, *args, **kwargs)
+    return _run
+
+
+# =============================================================================
+# RUN METRICS
+# =============================================================================
+
+class RunMetrics:
+    """Thread-safe per-stage timings and counters for one run.
+    
+    Args:
+        labels: Prometheus labels added to every metric (e.g. the tenant)
+    """
+
+    def __init__(self, labels=None):
+        self._lock = threading.Lock()
+        self.labels = dict(labels or {})
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self._started = time.perf_counter()
+            self.stages = {}
+            self.counters = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage; repeated or concurrent entries accumulate.
+        
+        When profiling is enabled (--profile / BIRTHDAY_PROFILE), the stage is
+        also profiled.
+        """
+        started = time.perf_counter()
+        try:
+            if PROFILER:
+                with PROFILER.profile(name):
+                    yield
+            else:
+                yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, elapsed):
+        """Add a measured duration to a stage."""
+        with self._lock:
+            seconds, count = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (seconds + elapsed, count + 1)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def set(self, name, value):
+        with self._lock:
+            self.counters[name] = value
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'duration_seconds': round(time.perf_counter() - self._started, 4),
+                'stages': {
+                    name: {'seconds': round(seconds, 4), 'count': count}
+                    for name, (seconds, count) in self.stages.items()
+                },
+                'counters': {name: int(value) if float(value).is_integer() else value
+                             for name, value in self.counters.items()},
+            }
+
+    def to_prometheus(self):
+        """Render the run as Prometheus text exposition format."""
+        report = self.to_dict()
+        
+        def _labels(**extra):
+            pairs = {**self.labels, **extra}
+            return "{" + ",".join(f'{key}="{value}"' for key, value in pairs.items()) + "}" if pairs else ""
+        
+        lines = [
+            "# HELP birthday_bot_stage_duration_seconds Time spent in each stage of the last run.",
+            "# TYPE birthday_bot_stage_duration_seconds gauge",
+        ]
+        for name, stage in report['stages'].items():
+            lines.append(f'birthday_bot_stage_duration_seconds{_labels(stage=name)} {stage["seconds"]}')
+        for name, value in sorted(report['counters'].items()):
+            lines.append(f"# TYPE birthday_bot_{name} gauge")
+            lines.append(f"birthday_bot_{name}{_labels()} {value}")
+        lines.append("# TYPE birthday_bot_run_duration_seconds gauge")
+        lines.append(f"birthday_bot_run_duration_seconds{_labels()} {report['duration_seconds']}")
+        lines.append("# TYPE birthday_bot_last_run_timestamp_seconds gauge")
+        lines.append(f"birthday_bot_last_run_timestamp_seconds{_labels()} {int(self.started_at)}")
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self, json_path=None, prometheus_path=None):
+        """Print a stage summary and write the configured report files."""
+        report = self.to_dict()
+        summary = ", ".join(f"{name} {stage['seconds'] * 1000:.0f} ms" for name, stage in report['stages'].items())
+        print(f"⏱  {summary or 'no stages'} (total {report['duration_seconds'] * 1000:.0f} ms)")
+        try:
+            if json_path:
+                _write_file_atomic(json_path, json.dumps(report, indent=2).encode('utf-8'))
+            if prometheus_path:
+                _write_file_atomic(prometheus_path, self.to_prometheus().encode('utf-8'))
+        except OSError as e:
+            logging.error(f"Could not write run report: {e}")
+
+
+class _TenantMetrics:
+    """Stand-in for the current tenant's RunMetrics (the process-wide one otherwise)."""
+
+    def __init__(self, default):
+        self._default = default
+
+    def __getattr__(self, name):
+        tenant = _current_tenant.get()
+        return getattr(tenant.metrics if tenant is not None else self._default, name)
+
+
+METRICS = _TenantMetrics(RunMetrics())
+
+
+# =============================================================================
+# PROFILING
+# =============================================================================
+
+class StageProfiler:
+    """cProfile + tracemalloc per pipeline stage.
+    
+    For each stage it writes, into out_dir:
+      <stage>.pstats     cProfile data (snakeviz, gprof2dot, flameprof, pstats)
+      <stage>.folded     collapsed stacks for flamegraph.pl / speedscope
+      <stage>.alloc.txt  top allocation sites while the stage ran
+    
+    Only the thread entering the stage is profiled, and only one stage at a
+    time: nested stages are attributed to the outermost one.
+    """
+
+    def __init__(self, out_dir, top=15):
+        import cProfile
+        import pstats
+        import tracemalloc
+        
+        self._cProfile = cProfile
+        self._pstats = pstats
+        self._tracemalloc = tracemalloc
+        self.out_dir = out_dir
+        self.top = top
+        self._busy = threading.Lock()
+        os.makedirs(out_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    @contextmanager
+    def profile(self, name):
+        # Only one profiler can be active per interpreter, so stages entered
+        # while another is being profiled (nested or from other threads) are
+        # just timed
+        if not self._busy.acquire(blocking=False):
+            yield
+            return
+        
+        before = self._tracemalloc.take_snapshot()
+        profiler = self._cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            after = self._tracemalloc.take_snapshot()
+            self._busy.release()
+            self._write(name, profiler, before, after)
+
+    def _write(self, name, profiler, before, after):
+        path = os.path.join(self.out_dir, name)
+        try:
+            # Repeated stages accumulate into the same profile
+            if os.path.exists(f"{path}.pstats"):
+                stats = self._pstats.Stats(profiler)
+                stats.add(f"{path}.pstats")
+            else:
+                stats = self._pstats.Stats(profiler)
+            stats.dump_stats(f"{path}.pstats")
+            
+            with open(f"{path}.folded", 'w') as f:
+                f.writelines(f"{stack} {weight}\n" for stack, weight in _folded_stacks(stats.stats))
+            
+            ignore = [self._tracemalloc.Filter(False, self._tracemalloc.__file__),
+                      self._tracemalloc.Filter(False, self._cProfile.__file__),
+                      self._tracemalloc.Filter(False, self._pstats.__file__)]
+            allocations = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+            with open(f"{path}.alloc.txt", 'w') as f:
+                f.writelines(f"{entry}\n" for entry in allocations[:50])
+        except OSError as e:
+            logging.error(f"Could not write profile for {name}: {e}")
+            return
+        
+        print(f"\n📊 Profile: {name}")
+        summary = io.StringIO()
+        self._pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(self.top)
+        print("\n".join(line for line in summary.getvalue().splitlines() if line.strip())[:4000])
+        print("   Top allocations:")
+        for entry in allocations[:5]:
+            print(f"     {entry}")
+
+
+def _folded_stacks(stats, min_microseconds=1):
+    """Approximate collapsed stacks ('a;b;c <microseconds>') from cProfile caller edges.
+    
+    cProfile only records caller -> callee edges, so time is attributed down
+    each path in proportion to that path's share of the caller's time (the
+    same approach flameprof uses).
+    """
+    def _label(func):
+        filename, line, function = func
+        return f"{function} ({os.path.basename(filename)}:{line})".replace(';', ',').replace(' ', '_')
+    
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge))
+    roots = [func for func, (_, _, _, _, callers) in stats.items() if not callers]
+    
+    folded = defaultdict(float)
+    
+    def _walk(func, stack, share, depth):
+        _, _, self_time, cumulative, _ = stats[func]
+        frames = stack + [_label(func)]
+        folded[';'.join(frames)] += self_time * share
+        if depth > 60:
+            return
+        for child, (_, _, edge_self, edge_cumulative) in callees.get(func, []):
+            if _label(child) in stack or not stats[child][3]:
+                continue
+            child_share = share * edge_cumulative / stats[child][3]
+            if edge_cumulative * share * 1e6 >= min_microseconds:
+                _walk(child, frames, min(child_share, 1.0), depth + 1)
+    
+    for root in roots:
+        _walk(root, [], 1.0, 0)
+    return [(stack, int(seconds * 1e6)) for stack, seconds in folded.items() if seconds * 1e6 >= min_microseconds]
+
+
+PROFILER = None
+
+
+def enable_profiling(out_dir=None):
+    """Turn on per-stage profiling for the rest of the process."""
+    global PROFILER
+    PROFILER = StageProfiler(out_dir or PROFILE_DIR)
+    print(f"📊 Profiling enabled, writing to {PROFILER.out_dir}")
+
+
+# =============================================================================
+# HTTP CLIENT
+# =============================================================================
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace requests to a rate-limited API."""
+
+    def __init__(self, limit, period):
+        self._lock = threading.Lock()
+        self.capacity = float(limit)
+        self.rate = limit / period
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def update(self, limit=None, period=None, used=None):
+        """Adjust to the limits (and current usage) reported by the server."""
+        with self._lock:
+            self._refill()
+            if limit and period:
+                self.capacity = float(limit)
+                self.rate = limit / period
+            if used is not None:
+                self.tokens = min(self.tokens, self.capacity - used)
+
+
+_http_lock = threading.Lock()
+_http_session = None
+# Token buckets by URL prefix
+_rate_limiters = {
+    PC_BASE_URL: TokenBucket(PC_RATE_LIMIT, PC_RATE_PERIOD),
+}
+
+# Statuses worth retrying. POSTs are only retried when the server certainly
+# did not act on them, so a WhatsApp message is never sent twice.
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_RETRY_STATUSES_UNSAFE = {429, 503}
+
+
+def get_http_session():
+    """Return the shared keep-alive session (one connection pool per host)."""
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            with _timed_init("create HTTP session"):
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(10, PC_MAX_CONCURRENCY))
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+
+
+def _retry_delay(response, attempt):
+    """Seconds to wait before the next attempt: Retry-After if given, else backoff with full jitter."""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(HTTP_BACKOFF_MAX, max(0.0, delay))
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _update_rate_limit(bucket, response):
+    """Feed Planning Center's rate-limit headers back into its token bucket."""
+    headers = response.headers
+    try:
+        limit = int(headers['X-PCO-API-Request-Rate-Limit'])
+        period = int(headers['X-PCO-API-Request-Rate-Period'])
+        used = int(headers['X-PCO-API-Request-Rate-Count'])
+    except (KeyError, ValueError):
+        return
+    bucket.update(limit, period, used)
+
+
+def http_request(method, url, **kwargs):
+    """Send a request through the shared session, retrying transient failures.
+    
+    Requests to rate-limited hosts are paced by a token bucket. 429 and 5xx
+    responses and connection errors are retried with exponential backoff and
+    jitter, honoring Retry-After.
+    
+    Returns:
+        requests.Response: The final response (which may still be an error)
+    
+    Raises:
+        requests.RequestException: If the last attempt failed to connect
+    """
+    kwargs.setdefault('timeout', 30)
+    kwargs.setdefault('verify', True)
+    idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+    retry_statuses = _RETRY_STATUSES if idempotent else _RETRY_STATUSES_UNSAFE
+    retry_errors = (requests.ConnectionError, requests.Timeout) if idempotent else requests.ConnectTimeout
+    tenant = _current_tenant.get()
+    limiters = tenant.rate_limiters if tenant is not None else _rate_limiters
+    bucket = next((b for prefix, b in limiters.items() if url.startswith(prefix)), None)
+    session = get_http_session()
+    
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        if bucket:
+            bucket.acquire()
+        METRICS.incr('http_requests')
+        try:
+            response = session.request(method, url, **kwargs)
+        except retry_errors as e:
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+            METRICS.incr('http_retries')
+            delay = _retry_delay(None, attempt)
+            logging.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+        
+        if bucket:
+            _update_rate_limit(bucket, response)
+        body = response.request.body if response.request is not None else None
+        METRICS.incr('http_bytes_sent', len(body) if body else 0)
+        if not kwargs.get('stream'):
+            METRICS.incr('http_bytes_received', len(response.content or b''))
+        if response.status_code not in retry_statuses or attempt == HTTP_MAX_RETRIES:
+            return response
+        
+        METRICS.incr('http_retries')
+        delay = _retry_delay(response, attempt)
+        logging.warning(f"{method} {url} returned HTTP {response.status_code}, retrying in {delay:.1f}s")
+        response.close()
+        time.sleep(delay)
+
+
+def _request_never_sent(error):
+    """Whether a failed request certainly never reached the server."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError):
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, urllib3.exceptions.NewConnectionError)
+    return False
+
+
+def send_whatsapp_template(template_name, parameters=None, media_id=None, to=None):
     """Send a WhatsApp message using a template.
     
     Args:
         template_name: Name of the approved WhatsApp template
         parameters: List of text parameters for the template body
         media_id: Optional media ID for templates with image headers
+        to: Recipient phone number (defaults to TARGET_PHONE_NUMBER)
     
     Returns:
         bool: True if successful, False otherwise
     """
-    if not WHATSAPP_API_TOKEN or not WHATSAPP_PHONE_NUMBER_ID:
+    return deliver_whatsapp_template(template_name, parameters, media_id, to) == 'sent'
+
+
+def deliver_whatsapp_template(template_name, parameters=None, media_id=None, to=None):
+    """Send a WhatsApp template message and tell failures that may have been delivered apart.
+    
+    Takes the same arguments as send_whatsapp_template().
+    
+    Returns:
+        str: 'sent' on success; 'failed' if WhatsApp certainly did not act
+        (no connection, a 4xx, 429 or 503 response), so the message can be
+        sent again; 'unknown' if it may have been delivered (a timeout after
+        the request went out, other 5xx responses), so it must not be resent
+    """
+    if not setting('WHATSAPP_API_TOKEN') or not setting('WHATSAPP_PHONE_NUMBER_ID'):
         print("❌ Error: WhatsApp credentials not configured.")
-        return False
+        return 'failed'
 
-    url = f"https://graph.facebook.com/v21.0/{WHATSAPP_PHONE_NUMBER_ID}/messages"
+    url = f"{WHATSAPP_GRAPH_URL}/{setting('WHATSAPP_PHONE_NUMBER_ID')}/messages"
     headers = {
-        "Authorization": f"Bearer {WHATSAPP_API_TOKEN}",
+        "Authorization": f"Bearer {setting('WHATSAPP_API_TOKEN')}",
         "Content-Type": "application/json"
     }
     
-    clean_number = ''.join(filter(str.isdigit, TARGET_PHONE_NUMBER))
+    clean_number = ''.join(filter(str.isdigit, to or setting('TARGET_PHONE_NUMBER')))
     
     # Build template components
     components = []
@@ -91,73 +718,410 @@ def send_whatsapp_template(template_name, parameters=None, media_id=None):
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload, timeout=30, verify=True)
+        response = http_request('POST', url, headers=headers, json=payload, timeout=30)
         if response.status_code == 200:
             print(f"✅ WhatsApp template '{template_name}' sent successfully to {clean_number}")
-            return True
+            return 'sent'
         else:
             logging.error(f"Error sending WhatsApp template: {response.status_code}")
-            return False
+            if response.status_code < 500 or response.status_code == 503:
+                return 'failed'
+            return 'unknown'
     except requests.RequestException as e:
         logging.error(f"Exception sending WhatsApp template: {e}")
-        return False
+        return 'failed' if _request_never_sent(e) else 'unknown'
 
 
 
-def get_birthdays_today():
-    """Fetch people from Planning Center with today's birthdays."""
-    auth = (PLANNING_CENTER_APP_ID, PLANNING_CENTER_SECRET)
-    base_url = "https://api.planningcenteronline.com/people/v2"
+def send_template_to_recipients(recipients, template_name, parameters=None, media_id=None):
+    """Send the same template to many recipients concurrently.
+    
+    Sends are paced to WA_MESSAGES_PER_SECOND and reuse one uploaded media_id.
+    
+    Args:
+        recipients: Phone numbers to send to (duplicates are sent once)
+        template_name: Name of the approved WhatsApp template
+        parameters: List of text parameters for the template body
+        media_id: Optional media ID for templates with image headers
+    
+    Returns:
+        dict: Mapping of recipient number to True (sent) or False (failed)
+    """
+    recipients = list(dict.fromkeys(''.join(filter(str.isdigit, r)) for r in recipients))
+    recipients = [r for r in recipients if r]
+    if not recipients:
+        return {}
+    
+    pacer = TokenBucket(WA_MESSAGES_PER_SECOND, 1)
+    
+    def _send(number):
+        pacer.acquire()
+        return send_whatsapp_template(template_name, parameters=parameters, media_id=media_id, to=number)
+    
+    workers = min(WA_MAX_CONCURRENCY, len(recipients))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(zip(recipients, executor.map(_in_context(_send), recipients)))
+    
+    sent = sum(results.values())
+    print(f"✓ Sent '{template_name}' to {sent}/{len(results)} recipient(s)")
+    for number, ok in results.items():
+        if not ok:
+            print(f"   ❌ {number}")
+    return results
 
-    today = datetime.now()
-    month = today.month
-    day = today.day
 
-    birthdays = []
+# Decoded bodies of recently revalidated responses (least recently used
+# first), so a daemon skips re-parsing the usual pages on 304
+_http_cache_memory = OrderedDict()
+_http_cache_memory_lock = threading.Lock()
+_http_cache_unusable = set()  # cache database paths that failed; skipped for the rest of the process
 
-    # Fetch people with birthdays
-    birthday_url = f"{base_url}/birthday_people"
+
+def _http_cache_failed(e):
+    """Turn the HTTP cache off for this database after an error, logging it once.
+    
+    A lock held by another connection is only temporary, so it just skips
+    one response.
+    """
+    if isinstance(e, sqlite3.OperationalError) and 'locked' in str(e):
+        logging.warning(f"HTTP cache busy, response not cached: {e}")
+        return
+    path = setting('CACHE_DB_PATH')
+    with _http_cache_memory_lock:
+        if path in _http_cache_unusable:
+            return
+        _http_cache_unusable.add(path)
+    logging.error(f"HTTP cache unavailable, disabled until restart: {e}")
+
+
+def _keep_in_memory(cache_key, entry):
+    with _http_cache_memory_lock:
+        _http_cache_memory[cache_key] = entry
+        _http_cache_memory.move_to_end(cache_key)
+        while len(_http_cache_memory) > HTTP_CACHE_MEMORY_ENTRIES:
+            _http_cache_memory.popitem(last=False)
+
+
+def _cached_response(cache_key):
+    """Return the cached (etag, last_modified, data) for a URL, if any."""
+    with _http_cache_memory_lock:
+        entry = _http_cache_memory.get(cache_key)
+        if entry is not None:
+            _http_cache_memory.move_to_end(cache_key)
+            return entry
     try:
-        response = requests.get(birthday_url, auth=auth, timeout=30, verify=True)
-    except requests.RequestException as e:
-        logging.error(f"Network error fetching birthdays: {e}")
-        return birthdays
+        with closing(open_cache_db()) as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE url = ?", (cache_key,)
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        _http_cache_failed(e)
+        return None
+    if not row:
+        return None
+    try:
+        entry = (row['etag'], row['last_modified'], json.loads(row['body']))
+    except ValueError:
+        return None
+    _keep_in_memory(cache_key, entry)
+    return entry
 
-    if response.status_code == 200:
+
+def _remember_response(cache_key, etag, last_modified, body, data, refresh_only=False):
+    """Store a response with its validators, or just mark it as recently used.
+    
+    Caching is best effort: if another connection holds the write lock (e.g.
+    a people cache sync), the response is not stored rather than waiting.
+    """
+    _keep_in_memory(cache_key, (etag, last_modified, data))
+    try:
+        with closing(open_cache_db(timeout=1)) as conn, conn:
+            if refresh_only:
+                conn.execute("UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), cache_key))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (cache_key, etag, last_modified, body, time.time())
+                )
+                conn.execute("DELETE FROM http_cache WHERE fetched_at < ?", (time.time() - HTTP_CACHE_DAYS * 86400,))
+    except (sqlite3.Error, OSError) as e:
+        _http_cache_failed(e)
+
+
+def fetch_pco_json(url, params=None, use_cache=None):
+    """GET a Planning Center endpoint and return the decoded JSON body.
+    
+    Responses carrying an ETag or Last-Modified header are cached in the
+    local database and revalidated with If-None-Match/If-Modified-Since, so
+    an unchanged resource costs a bodiless 304 instead of a download. The
+    returned data may be shared with the cache and must not be modified.
+    
+    Args:
+        url: Endpoint URL
+        params: Query parameters
+        use_cache: Use conditional requests (defaults to HTTP_CACHE_ENABLED)
+    
+    Raises:
+        requests.RequestException: On network errors or non-200 responses
+        ValueError: If the body is not valid JSON
+    """
+    auth = (setting('PLANNING_CENTER_APP_ID'), setting('PLANNING_CENTER_SECRET'))
+    use_cache = HTTP_CACHE_ENABLED if use_cache is None else use_cache
+    use_cache = use_cache and setting('CACHE_DB_PATH') not in _http_cache_unusable
+    
+    headers = {}
+    cached = None
+    if use_cache:
+        # Responses depend on the credentials, so they are part of the key
+        cache_key = f"{setting('PLANNING_CENTER_APP_ID')}@{requests.Request('GET', url, params=params).prepare().url}"
+        cached = _cached_response(cache_key)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+    
+    response = http_request('GET', url, auth=auth, params=params, headers=headers, timeout=30)
+    if response.status_code == 304 and cached:
+        METRICS.incr('http_cache_hits')
+        _remember_response(cache_key, *cached[:2], None, cached[2], refresh_only=True)
+        return cached[2]
+    if response.status_code != 200:
+        raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+    
+    data = response.json()
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if use_cache and (etag or last_modified):
+        _remember_response(cache_key, etag, last_modified, response.content, data)
+    return data
+
+
+class _JsonStream:
+    """Incremental reader for a JSON document arriving in byte chunks."""
+    
+    _decoder = json.JSONDecoder()
+    _OUTSIDE_STRING = re.compile(r'["{}\[\]]')
+    _INSIDE_STRING = re.compile(r'["\\]')
+    _SCALAR_TOKEN = re.compile(r'[-+.0-9A-Za-z]*')  # numbers, true, false, null
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+
+    def _more(self):
+        """Append the next chunk to the buffer, dropping what was consumed; False at the end."""
+        chunk = next(self._chunks, None)
+        text = self._utf8.decode(chunk or b'', final=chunk is None)
+        if chunk is None and not text:
+            return False
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._more():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} but found {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next JSON value, reading more chunks until it is complete."""
+        if self.peek() not in '{["':
+            # Numbers and literals have no closing delimiter, and a prefix
+            # such as "-2." may already decode, so read until the token is
+            # followed by another character (or the document ends)
+            while self._SCALAR_TOKEN.match(self.buf, self.pos).end() == len(self.buf) and self._more():
+                pass
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def skip(self):
+        """Consume the next JSON value without building it."""
+        if self.peek() not in '{[':
+            self.value()
+            return
+        depth = 0
+        in_string = False
+        while True:
+            pattern = self._INSIDE_STRING if in_string else self._OUTSIDE_STRING
+            match = pattern.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self._more():
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+            char = match.group()
+            self.pos = match.end()
+            if char == '\\':
+                # Skip the escaped character, which may be in the next chunk
+                if self.pos == len(self.buf) and not self._more():
+                    raise ValueError("Unexpected end of JSON document")
+                self.pos += 1
+            elif char == '"':
+                in_string = not in_string
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def _stream_pco_page(url, params, links):
+    """Yield the `data` resources of one JSON:API page while it downloads.
+    
+    Only one resource is decoded at a time; other top-level members (such as
+    `included`) are skipped without being built, except `links`, which is
+    copied into the given dict.
+    
+    Raises:
+        requests.RequestException: On network errors or non-200 responses
+        ValueError: If the body is not a JSON:API collection
+    """
+    auth = (setting('PLANNING_CENTER_APP_ID'), setting('PLANNING_CENTER_SECRET'))
+    response = http_request('GET', url, auth=auth, params=params, timeout=30, stream=True)
+    with closing(response):
+        if response.status_code != 200:
+            raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+        
+        def _chunks():
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                METRICS.incr('http_bytes_received', len(chunk))
+                yield chunk
+        
+        stream = _JsonStream(_chunks())
+        stream.expect('{')
+        while stream.peek() != '}':
+            key = stream.value()
+            stream.expect(':')
+            if key == 'data':
+                stream.expect('[')
+                while stream.peek() != ']':
+                    yield stream.value()
+                    if stream.peek() == ',':
+                        stream.pos += 1
+                stream.pos += 1
+            elif key == 'links':
+                links.update(stream.value() or {})
+            else:
+                stream.skip()
+            if stream.peek() == ',':
+                stream.pos += 1
+
+
+def iter_pco_resources(url, params=None, label="resources", raise_errors=False, stream=None, use_cache=None):
+    """Lazily yield JSON:API resources from a Planning Center collection.
+    
+    Follows `links.next` page by page, so callers only hold one page in memory
+    and lists longer than a single page are read completely. In streaming
+    mode not even a whole page is held: resources are parsed one at a time
+    as the body downloads.
+    
+    Args:
+        url: Collection URL to start from
+        params: Query parameters for the first request (`next` links already
+            carry them for subsequent pages)
+        label: Description used in error messages
+        raise_errors: Re-raise failures instead of logging and stopping early,
+            for callers that must not act on a partial collection
+        stream: Parse pages incrementally (defaults to PC_STREAM_JSON)
+        use_cache: Revalidate pages with the HTTP cache (defaults to
+            HTTP_CACHE_ENABLED; never used when streaming)
+    
+    Yields:
+        dict: Each resource in the `data` array of every page
+    """
+    params = dict(params or {})
+    params.setdefault('per_page', PC_PAGE_SIZE)
+    stream = PC_STREAM_JSON if stream is None else stream
+    
+    while url:
+        links = {}
         try:
-            data = response.json()
-        except ValueError:
-            logging.error("Invalid JSON in birthday response")
-            return birthdays
-        people_list = data.get('data', {}).get('attributes', {}).get('people', [])
-        if not isinstance(people_list, list):
-            logging.error("Unexpected birthday response structure")
-            return birthdays
-        for person in people_list:
-            birthdate_str = person.get('birthdate')
-            if birthdate_str:
-                bdate = None
-                for fmt in ('%Y-%m-%d', '%m-%d'):
-                    try:
-                        bdate = datetime.strptime(birthdate_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                if bdate and bdate.month == month and bdate.day == day:
-                    birthdays.append({'name': person.get('name')})
-    else:
-        logging.error(f"Error fetching birthdays: HTTP {response.status_code}")
+            if stream:
+                yield from _stream_pco_page(url, params, links)
+            else:
+                page = fetch_pco_json(url, params, use_cache=use_cache)
+                resources = page.get('data', [])
+                if not isinstance(resources, list):
+                    raise ValueError(f"Unexpected {label} response structure")
+                links = page.get('links') or {}
+                yield from resources
+        except requests.RequestException as e:
+            if raise_errors:
+                raise
+            logging.error(f"Error fetching {label}: {e}")
+            return
+        except ValueError as e:
+            if raise_errors:
+                raise
+            logging.error(f"Invalid {label} response: {e}")
+            return
+        
+        url = links.get('next')
+        params = None
+
+
+def get_birthdays_today(use_cache=None):
+    """Fetch people from Planning Center with today's birthdays.
+    
+    Args:
+        use_cache: Answer from the local people cache (defaults to
+            PEOPLE_CACHE_ENABLED); falls back to the API if it was never synced
+    
+    Raises:
+        requests.RequestException, ValueError: If the list could not be read
+            completely, rather than returning part of it
+    """
+    base_url = setting('PC_BASE_URL')
+
+    today = datetime.now()
+
+    if _use_people_cache(use_cache):
+        birthdays, _ = celebrations_for_date(get_celebration_calendar(), today)
+        return birthdays
+
+    # Let Planning Center filter by month/day so only today's matches are sent
+    # (one query per celebrated day, to include Feb 29 birthdays on Feb 28)
+    birthdays = []
+    for month, day in sorted(celebration_days(today)):
+        params = {
+            'where[birthdate_month]': month,
+            'where[birthdate_day]': day,
+        }
+        people = iter_pco_resources(f"{base_url}/people", params, label="birthdays", raise_errors=True)
+        birthdays.extend({'name': person['attributes'].get('name')} for person in people)
     
     return birthdays
 
 
 def get_person_household(person_id):
     """Fetch the household ID for a specific person."""
-    auth = (PLANNING_CENTER_APP_ID, PLANNING_CENTER_SECRET)
-    url = f"https://api.planningcenteronline.com/people/v2/people/{person_id}/households"
+    auth = (setting('PLANNING_CENTER_APP_ID'), setting('PLANNING_CENTER_SECRET'))
+    url = f"{setting('PC_BASE_URL')}/people/{person_id}/households"
     
     try:
-        response = requests.get(url, auth=auth, timeout=30, verify=True)
+        response = http_request('GET', url, auth=auth, timeout=30)
     except requests.RequestException as e:
         logging.error(f"Network error fetching household for person {person_id}: {e}")
         return None
@@ -174,64 +1138,109 @@ def get_person_household(person_id):
     return None
 
 
-def get_anniversaries_today():
-    """Fetch couples with anniversaries today, grouped by household."""
-    auth = (PLANNING_CENTER_APP_ID, PLANNING_CENTER_SECRET)
-    base_url = "https://api.planningcenteronline.com/people/v2"
+def build_household_index(people):
+    """Map person IDs to household IDs from JSON:API relationship data.
     
-    today = datetime.now()
-    today_month = today.month
-    today_day = today.day
+    Only people whose response carried a `households` relationship (i.e. the
+    request used include=households) are indexed; callers can fall back to
+    get_person_household() for anyone else.
     
-    # Fetch people from anniversary list
-    anniversary_url = f"{base_url}/lists/4700166/people"
-    try:
-        response = requests.get(anniversary_url, auth=auth, timeout=30, verify=True)
-    except requests.RequestException as e:
-        logging.error(f"Network error fetching anniversaries: {e}")
-        return []
+    Args:
+        people: List of Person resources from a Planning Center response
     
-    if response.status_code != 200:
-        logging.error(f"Error fetching anniversaries: HTTP {response.status_code}")
-        return []
+    Returns:
+        dict: Mapping of person ID to household ID (or None if not in one)
+    """
+    index = {}
+    for person in people:
+        relationship = (person.get('relationships') or {}).get('households')
+        if not isinstance(relationship, dict) or 'data' not in relationship:
+            continue
+        linked = relationship['data'] or []
+        index[person['id']] = linked[0].get('id') if linked else None
+    return index
+
+
+def get_anniversaries_today(use_cache=None):
+    """Fetch couples with anniversaries today, grouped by household.
     
-    try:
-        people_data = response.json()
-    except ValueError:
-        logging.error("Invalid JSON in anniversary response")
-        return []
+    Args:
+        use_cache: Answer from the local people cache (defaults to
+            PEOPLE_CACHE_ENABLED); falls back to the API if it was never synced
+    
+    Raises:
+        requests.RequestException, ValueError: If the list could not be read
+            completely, since a partial list would split couples
+    """
+    base_url = setting('PC_BASE_URL')
+    
+    today = datetime.now()
+    today_days = celebration_days(today)
+    
+    if _use_people_cache(use_cache):
+        _, anniversaries = celebrations_for_date(get_celebration_calendar(), today)
+        return anniversaries
+    
+    # Fetch people from anniversary list. There is no anniversary month/day
+    # filter, so the date check stays client-side while pages stream in.
+    anniversary_url = f"{base_url}/lists/{setting('PC_ANNIVERSARY_LIST_ID')}/people"
+    people = iter_pco_resources(anniversary_url, {'include': 'households'}, label="anniversaries",
+                                raise_errors=True)
+    
+    matches = []
+    households = {}
+    lookups = {}
+    # Household membership comes back with the list (include=households), so
+    # only people without relationship data need an individual lookup. Those
+    # start as soon as the person is matched, while later pages stream in.
+    with ThreadPoolExecutor(max_workers=PC_MAX_CONCURRENCY) as executor:
+        for person in people:
+            attrs = person['attributes']
+            anniversary = attrs.get('anniversary')
+            
+            # Skip if no anniversary or anniversary doesn't match today
+            if not anniversary:
+                continue
+            
+            if parse_month_day(anniversary) not in today_days:
+                continue
+            
+            matches.append({
+                'id': person['id'],
+                'name': attrs['name'],
+                'first_name': attrs.get('first_name'),
+                'last_name': attrs.get('last_name'),
+                'anniversary': anniversary
+            })
+            
+            linked = build_household_index([person])
+            if linked:
+                households.update(linked)
+            elif person['id'] not in lookups:
+                lookups[person['id']] = executor.submit(_in_context(get_person_household), person['id'])
+        
+        if lookups:
+            with METRICS.stage('household_resolution'):
+                households.update({person_id: lookup.result() for person_id, lookup in lookups.items()})
+    
+    return group_anniversary_couples(matches, households)
+
+def group_anniversary_couples(matches, households):
+    """Group people celebrating an anniversary into couples by household.
+    
+    Args:
+        matches: List of person dicts (id, name, first_name, last_name, anniversary)
+        households: Mapping of person ID to household ID
     
+    Returns:
+        list: Dicts with the display 'name' of each couple or single person
+    """
     # Group people by household ID
     household_groups = defaultdict(list)
     people_without_households = []
     
-    for person in people_data.get('data', []):
-        attrs = person['attributes']
-        anniversary = attrs.get('anniversary')
-        person_id = person['id']
-        
-        # Skip if no anniversary or anniversary doesn't match today
-        if not anniversary:
-            continue
-        
-        try:
-            anniv_date = datetime.strptime(anniversary, '%Y-%m-%d')
-            if anniv_date.month != today_month or anniv_date.day != today_day:
-                continue
-        except ValueError:
-            continue
-        
-        # Fetch household ID from API
-        household_id = get_person_household(person_id)
-        
-        person_info = {
-            'id': person_id,
-            'name': attrs['name'],
-            'first_name': attrs.get('first_name'),
-            'last_name': attrs.get('last_name'),
-            'anniversary': anniversary
-        }
-        
+    for person_info in matches:
+        household_id = households.get(person_info['id'])
         if household_id:
             household_groups[household_id].append(person_info)
         else:
@@ -261,303 +1270,1498 @@ def get_anniversaries_today():
     
     return anniversaries
 
-def overlay_text_on_template(template_path, text, output_path):
-    """Overlay text on a template image using Pillow with dynamic font sizing."""
+
+# =============================================================================
+# LOCAL PEOPLE CACHE
+# =============================================================================
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS people (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    birthdate TEXT,
+    anniversary TEXT,
+    household_id TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS list_members (
+    list_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    PRIMARY KEY (list_id, person_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_date TEXT PRIMARY KEY,
+    roster_hash TEXT NOT NULL,
+    render_hash TEXT,
+    media_ids TEXT,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outbox (
+    run_date TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    recipient TEXT NOT NULL,
+    media_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_date, page, recipient)
+);
+CREATE TABLE IF NOT EXISTS media_cache (
+    content_hash TEXT NOT NULL,
+    phone_number_id TEXT NOT NULL,
+    media_id TEXT NOT NULL,
+    uploaded_at REAL NOT NULL,
+    PRIMARY KEY (content_hash, phone_number_id)
+);
+-- Month/day lookups use the in-memory calendar; drop the indexes older caches still carry
+DROP INDEX IF EXISTS idx_people_birth_md;
+DROP INDEX IF EXISTS idx_people_anniv_md;
+"""
+
+
+def open_cache_db(path=None, timeout=30):
+    """Open the local cache database, creating its schema if needed.
+    
+    Args:
+        path: Database file (defaults to CACHE_DB_PATH)
+        timeout: Seconds to wait for another connection's lock
+    """
+    path = path or setting('CACHE_DB_PATH')
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=timeout)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_CACHE_SCHEMA)
+    return conn
+
+
+def check_cache_db():
+    """Log one clear error if the cache database cannot be written.
+    
+    Every cache and the run journal fall back quietly when the database is
+    unusable, so this makes a misconfigured CACHE_DB_PATH (e.g. a volume
+    owned by another user) visible at startup.
+    
+    Returns:
+        bool: True if the database accepts writes
+    """
+    path = setting('CACHE_DB_PATH')
     try:
-        if not os.path.exists(template_path):
-            print(f"❌ Template not found: {template_path}")
-            return False
+        with closing(open_cache_db(timeout=5)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.rollback()
+        return True
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Cache database {path} is not writable ({e}); running without the people, "
+                      f"HTTP and media caches and the run journal, so reruns may send again")
+        return False
 
-        img = Image.open(template_path)
-        draw = ImageDraw.Draw(img)
-        
-        W, H = img.size
-        
-        # Define safe text area (avoiding template title, footer, and side edges)
-        x_margin = int(W * 0.05)  # 5% margin on each side (90% safe width)
-        available_width = W - (2 * x_margin)
-        y_start = int(H * 0.25)   # Top 25% is template title
-        y_end = int(H * 0.80)     # Bottom 20% is footer
-        available_height = y_end - y_start
-        
-        # Split into lines but keep blank lines for section separation
-        lines = text.split('\n')
-        num_lines = len(lines)
-        
-        if num_lines == 0:
-            return True  # Nothing to draw
-        
-        # Identify section headers (will be bold)
-        section_headers = {"Cumpleaños", "Aniversario"}
-        
-        # Calculate optimal font sizes based on available vertical space
-        base_font_size = min(100, max(30, int(available_height / (num_lines * 1.3))))
-        
-        # Now check horizontal fit and scale down if any line overflows
-        def _load_fonts(base_size):
-            """Load all fonts at sizes relative to the given base size."""
-            s_size = int(base_size * 1.2)
-            n_size = base_size
-            d_size = int(base_size * 0.9)
-            try:
-                sf = ImageFont.truetype(FONT_BOLD_PATH, s_size)
-                nf = ImageFont.truetype(FONT_REGULAR_PATH, n_size)
-                df = ImageFont.truetype(FONT_REGULAR_PATH, d_size)
-            except Exception as e:
-                print(f"⚠️ Could not load Lora fonts, using default: {e}")
-                sf = nf = df = ImageFont.load_default()
-            return sf, nf, df, s_size, n_size, d_size
-        
-        # Iteratively shrink fonts until all lines fit within available_width
-        while base_font_size >= 20:
-            section_font, name_font, date_font, section_font_size, name_font_size, date_font_size = _load_fonts(base_font_size)
-            
-            fits = True
-            for line in lines:
-                if not line.strip():
-                    continue
-                font = section_font if line in section_headers else name_font
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
-                if text_width > available_width:
-                    fits = False
-                    break
-            
-            if fits:
-                break
-            base_font_size -= 2  # Shrink by 2px and retry
-        
-        # Final load at the determined size
-        section_font, name_font, date_font, section_font_size, name_font_size, date_font_size = _load_fonts(base_font_size)
 
-        # Calculate standard line heights for consistency
-        # Using a reference string "Ag" to get a consistent height across all lines
-        ref_bbox_section = draw.textbbox((0, 0), "Ag", font=section_font)
-        section_h = ref_bbox_section[3] - ref_bbox_section[1]
-        
-        ref_bbox_name = draw.textbbox((0, 0), "Ag", font=name_font)
-        name_h = ref_bbox_name[3] - ref_bbox_name[1]
+def _get_sync_state(conn, key):
+    row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+    return row['value'] if row else None
 
-        # Calculate total content height for vertical centering (excluding date)
-        total_content_height = 0
-        line_heights = []
-        date_line_index = -1
-        
-        for i, line in enumerate(lines):
-            # Check if this is the date line (last non-empty line)
-            is_date = False
-            if i == len(lines) - 1 and line.strip():
-                is_date = True
-                date_line_index = i
-            
-            # Determine which font and fixed height to use
-            if is_date:
-                current_font = date_font
-                h = 0
-                spacing_after = 0
-                # Don't include date in total height - it will be positioned separately
-                line_heights.append((0, 0, None))
-                continue
-            elif line in section_headers:
-                current_font = section_font
-                h = section_h
-                spacing_after = 12  # Spacing after section headers
-            # Check if this is a blank line (section separator)
-            elif line == "" or not line.strip():
-                # Skip blank lines but add extra spacing
-                line_heights.append((0, 35, None))  # Extra spacing between sections
-                total_content_height += 35
-                continue
-            else:
-                current_font = name_font
-                h = name_h
-                spacing_after = 15  # Normal spacing between names
-            
-            line_heights.append((h, spacing_after, current_font))
-            total_content_height += h + spacing_after
-        
-        # Center content vertically within the safe area
-        y_offset = y_start + (available_height - total_content_height) / 2
-        y_offset = max(y_start, y_offset)  # Ensure we don't go above start
-        
-        # Render all lines except the date
-        for i, line in enumerate(lines):
-            # Skip the date line - we'll render it separately at the bottom
-            if i == date_line_index:
-                continue
-                
-            h, spacing_after, current_font = line_heights[i]
-            
-            # Skip blank lines (they only contribute spacing)
-            if current_font is None:
-                y_offset += spacing_after
-                continue
-            
-            bbox = draw.textbbox((0, 0), line, font=current_font)
-            w = bbox[2] - bbox[0]
-            
-            # Center horizontally
-            x_pos = (W - w) / 2
-            
-            # Use darker color for section headers
-            text_color = SECTION_HEADER_COLOR if line in section_headers else TEXT_COLOR
-            
-            draw.text((x_pos, y_offset), line, font=current_font, fill=text_color)
-            
-            y_offset += h + spacing_after
+
+def _set_sync_state(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+
+def _upsert_person(conn, person):
+    """Store a Person resource, keeping the known household if none was included."""
+    attrs = person.get('attributes', {})
+    household_id = build_household_index([person]).get(person['id'], '')
+    conn.execute(
+        """
+        INSERT INTO people (id, name, first_name, last_name, birthdate, anniversary, household_id, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE SET
+            name = excluded.name,
+            first_name = excluded.first_name,
+            last_name = excluded.last_name,
+            birthdate = excluded.birthdate,
+            anniversary = excluded.anniversary,
+            household_id = CASE WHEN excluded.household_id = '' THEN people.household_id
+                                ELSE excluded.household_id END,
+            updated_at = excluded.updated_at
+        """,
+        (person['id'], attrs.get('name'), attrs.get('first_name'), attrs.get('last_name'),
+         attrs.get('birthdate'), attrs.get('anniversary'), household_id, attrs.get('updated_at'))
+    )
+    return attrs.get('updated_at')
+
+
+def _sync_people(conn, since, reconcile=False):
+    """Pull people changed since the given timestamp; returns the newest updated_at seen.
+    
+    With reconcile, everyone is listed instead, and people who are no longer
+    in Planning Center are removed from the cache. The listing includes
+    households, so it also clears memberships that changed without touching
+    the person.
+    """
+    base_url = setting('PC_BASE_URL')
+    params = {'order': 'updated_at', 'include': 'households'}
+    if since and not reconcile:
+        params['where[updated_at][gte]'] = since
+    
+    newest = since
+    seen = set()
+    for person in iter_pco_resources(f"{base_url}/people", params, label="people sync",
+                                     raise_errors=True, use_cache=False):
+        updated_at = _upsert_person(conn, person)
+        if updated_at and (not newest or updated_at > newest):
+            newest = updated_at
+        seen.add(person['id'])
+    
+    if not reconcile:
+        print(f"✓ Synced {len(seen)} changed people")
+        return newest
+    
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_people (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM seen_people")
+    conn.executemany("INSERT INTO seen_people (id) VALUES (?)", ((person_id,) for person_id in seen))
+    removed = conn.execute("DELETE FROM people WHERE id NOT IN (SELECT id FROM seen_people)").rowcount
+    conn.execute("DELETE FROM list_members WHERE person_id NOT IN (SELECT id FROM seen_people)")
+    print(f"✓ Synced all {len(seen)} people ({removed} removed)")
+    return newest
+
+
+def _sync_households(conn, since):
+    """Refresh household membership for households changed since the given timestamp."""
+    base_url = setting('PC_BASE_URL')
+    params = {'order': 'updated_at', 'include': 'people'}
+    if since:
+        params['where[updated_at][gte]'] = since
+    
+    newest = since
+    for household in iter_pco_resources(f"{base_url}/households", params, label="household sync",
+                                        raise_errors=True, use_cache=False):
+        members = ((household.get('relationships') or {}).get('people') or {}).get('data') or []
+        conn.executemany(
+            "UPDATE people SET household_id = ? WHERE id = ?",
+            [(household['id'], member['id']) for member in members]
+        )
+        updated_at = household.get('attributes', {}).get('updated_at')
+        if updated_at and (not newest or updated_at > newest):
+            newest = updated_at
+    return newest
+
+
+def _sync_list_members(conn, list_id, force=False):
+    """Refresh membership of a Planning Center list if it was refreshed since the last sync."""
+    base_url = setting('PC_BASE_URL')
+    state_key = f"list_{list_id}_refreshed_at"
+    
+    # The list resource itself is tiny; only re-read its members when it changed
+    list_data = fetch_pco_json(f"{base_url}/lists/{list_id}", use_cache=False).get('data', {})
+    refreshed_at = list_data.get('attributes', {}).get('refreshed_at') or ''
+    if not force and refreshed_at and refreshed_at == _get_sync_state(conn, state_key):
+        return
+    
+    member_ids = []
+    for person in iter_pco_resources(f"{base_url}/lists/{list_id}/people", {'include': 'households'},
+                                     label="list members", raise_errors=True, use_cache=False):
+        _upsert_person(conn, person)
+        member_ids.append((list_id, person['id']))
+    
+    conn.execute("DELETE FROM list_members WHERE list_id = ?", (list_id,))
+    conn.executemany("INSERT OR IGNORE INTO list_members (list_id, person_id) VALUES (?, ?)", member_ids)
+    _set_sync_state(conn, state_key, refreshed_at)
+
+
+def sync_people_cache(full_resync=False):
+    """Bring the local people cache up to date with Planning Center.
+    
+    Normal runs only transfer people and households whose `updated_at` is newer
+    than the previous sync; the anniversary list is re-read only when Planning
+    Center reports it was refreshed. Every PEOPLE_CACHE_RECONCILE_DAYS the
+    people sync lists everyone, to drop deleted people. Changes are committed atomically, so a
+    failed sync leaves the previous snapshot intact. The sync tracks changes
+    itself and holds the database write lock throughout, so its requests
+    bypass the HTTP cache.
+    
+    Args:
+        full_resync: Discard the cache and download everything again
+    
+    Returns:
+        bool: True if the cache is up to date, False if the sync failed
+    """
+    try:
+        with closing(open_cache_db()) as conn, conn:
+            if full_resync:
+                conn.execute("DELETE FROM people")
+                conn.execute("DELETE FROM list_members")
+                conn.execute("DELETE FROM sync_state")
             
-            # Safety check: stop if we're about to exceed the safe area
-            if y_offset > y_end:
-                print(f"⚠️ Warning: Truncating text, too many names to fit")
-                break
-        
-        # Render date at fixed position above "Salmo 103" (around 82% of height)
-        if date_line_index >= 0:
-            date_line = lines[date_line_index]
-            date_y = int(H * 0.82)  # Fixed position above scripture
+            people_since = _get_sync_state(conn, 'people_updated_at')
+            households_since = _get_sync_state(conn, 'households_updated_at')
             
-            bbox = draw.textbbox((0, 0), date_line, font=date_font)
-            w = bbox[2] - bbox[0]
-            x_pos = (W - w) / 2
+            reconciled_at = _get_sync_state(conn, 'reconciled_at')
+            reconcile = not reconciled_at or (
+                datetime.now() - datetime.fromisoformat(reconciled_at)
+                >= timedelta(days=PEOPLE_CACHE_RECONCILE_DAYS)
+            )
             
-            draw.text((x_pos, date_y), date_line, font=date_font, fill=TEXT_COLOR)
-
-        # Handle simplified saving based on extension
-        if output_path.lower().endswith(('.jpg', '.jpeg')):
-            img = img.convert('RGB')
-            img.save(output_path, quality=85)
-        else:
-            img.save(output_path)
+            people_newest = _sync_people(conn, people_since, reconcile=reconcile)
+            households_newest = _sync_households(conn, households_since)
+            _sync_list_members(conn, setting('PC_ANNIVERSARY_LIST_ID'), force=full_resync)
             
+            if people_newest:
+                _set_sync_state(conn, 'people_updated_at', people_newest)
+            if households_newest:
+                _set_sync_state(conn, 'households_updated_at', households_newest)
+            if reconcile:
+                _set_sync_state(conn, 'reconciled_at', datetime.now().isoformat(timespec='seconds'))
+            _set_sync_state(conn, 'synced_at', datetime.now().isoformat(timespec='seconds'))
         return True
-    except Exception as e:
-        print(f"❌ Error in Pillow overlay: {e}")
+    except (requests.RequestException, ValueError, sqlite3.Error, OSError) as e:
+        logging.error(f"People cache sync failed: {e}")
         return False
 
-def upload_media_to_whatsapp(image_path):
-    """Upload media to WhatsApp to get a media ID."""
-    url = f"https://graph.facebook.com/v21.0/{WHATSAPP_PHONE_NUMBER_ID}/media"
-    headers = {
-        "Authorization": f"Bearer {WHATSAPP_API_TOKEN}"
-    }
-    
+
+def _use_people_cache(use_cache):
+    """Whether a fetcher should answer from the local cache."""
+    if use_cache is None:
+        use_cache = setting('PEOPLE_CACHE_ENABLED')
+    if not use_cache:
+        return False
     try:
-        mime_type, _ = mimetypes.guess_type(image_path)
-        with open(image_path, 'rb') as f:
-            files = {
-                'file': (os.path.basename(image_path), f, mime_type),
-                'messaging_product': (None, 'whatsapp'),
-                'type': (None, mime_type)
-            }
-            response = requests.post(url, headers=headers, files=files, timeout=60, verify=True)
-            
-        if response.status_code == 200:
-            media_id = response.json().get('id')
-            return media_id
-        else:
-            logging.error(f"Error uploading media: {response.status_code}")
-            return None
-    except requests.RequestException as e:
-        logging.error(f"Exception in media upload: {e}")
+        with closing(open_cache_db()) as conn:
+            return _get_sync_state(conn, 'synced_at') is not None
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"People cache unavailable: {e}")
+        return False
+
+
+def load_cached_people():
+    """Load everyone in the local cache, flagging anniversary list members.
+    
+    Returns:
+        list: Person dicts (id, name, first_name, last_name, birthdate,
+        anniversary, household_id, on_anniversary_list)
+    """
+    with closing(open_cache_db()) as conn:
+        rows = conn.execute(
+            """
+            SELECT p.*, EXISTS (
+                SELECT 1 FROM list_members m WHERE m.list_id = ? AND m.person_id = p.id
+            ) AS on_anniversary_list
+            FROM people p ORDER BY p.rowid
+            """,
+            (setting('PC_ANNIVERSARY_LIST_ID'),)
+        ).fetchall()
+    return [
+        dict(row, household_id=row['household_id'] or None, on_anniversary_list=bool(row['on_anniversary_list']))
+        for row in rows
+    ]
+
+
+# =============================================================================
+# CELEBRATION CALENDAR
+# =============================================================================
+
+def parse_month_day(date_str):
+    """Return (month, day) for a 'YYYY-MM-DD' or year-less 'MM-DD' date, or None."""
+    if not date_str:
         return None
+    for fmt in ('%Y-%m-%d', '%m-%d'):
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+            return parsed.month, parsed.day
+        except ValueError:
+            continue
+    # strptime rejects 02-29 without a year, since it defaults to 1900
+    if date_str[-5:] == '02-29':
+        return 2, 29
+    return None
 
-def generate_combined_postcard(birthdays, anniversaries, output_filename="combined_celebrations.jpg"):
-    """Generate a single postcard combining birthdays and anniversaries.
+
+def celebration_days(date):
+    """Return the (month, day) keys celebrated on a date.
+    
+    Feb 29 birthdays and anniversaries are celebrated on Feb 28 in non-leap years.
+    """
+    days = {(date.month, date.day)}
+    if date.month == 2 and date.day == 28 and not calendar.isleap(date.year):
+        days.add((2, 29))
+    return days
+
+
+def build_celebration_calendar(people):
+    """Index people by the month/day of their birthday and anniversary.
     
     Args:
-        birthdays: List of birthday people
-        anniversaries: List of anniversary couples
-        output_filename: Output file name for the postcard
+        people: Person dicts as returned by load_cached_people(); anniversaries
+            only count for members of the anniversary list
     
     Returns:
-        bool: True if successful, False otherwise
+        dict: Mapping of (month, day) to {'birthdate': [...], 'anniversary': [...]}
     """
-    content = ""
+    index = defaultdict(lambda: {'birthdate': [], 'anniversary': []})
+    for person in people:
+        key = parse_month_day(person.get('birthdate'))
+        if key:
+            index[key]['birthdate'].append(person)
+        key = parse_month_day(person.get('anniversary'))
+        if key and person.get('on_anniversary_list', True):
+            index[key]['anniversary'].append(person)
+    return dict(index)
+
+
+_calendar_cache = {}  # cache database path -> (synced_at, calendar index)
+
+
+def get_celebration_calendar():
+    """Return the calendar index for the local cache, rebuilding it only after a sync."""
+    with closing(open_cache_db()) as conn:
+        synced_at = _get_sync_state(conn, 'synced_at')
+    path = setting('CACHE_DB_PATH')
+    cached = _calendar_cache.get(path)
+    if cached is None or cached[0] != synced_at:
+        cached = _calendar_cache[path] = (synced_at, build_celebration_calendar(load_cached_people()))
+    return cached[1]
+
+
+def celebrations_for_date(calendar_index, date):
+    """Look up one date in the calendar index.
     
-    # Birthday section
-    if birthdays:
-        content += "Cumpleaños\n"
-        for person in birthdays:
-            content += f"{person['name']}\n"
+    Returns:
+        tuple: (birthdays, anniversaries) in the same format as
+        get_birthdays_today() and get_anniversaries_today()
+    """
+    born = []
+    married = []
+    for key in sorted(celebration_days(date)):
+        entry = calendar_index.get(key)
+        if entry:
+            born.extend(entry['birthdate'])
+            married.extend(entry['anniversary'])
     
-    # Add spacing between sections if both exist
-    if birthdays and anniversaries:
-        content += "\n\n"  # Double blank line for clear section separation
+    birthdays = [{'name': person['name']} for person in born]
+    households = {person['id']: person['household_id'] for person in married}
+    return birthdays, group_anniversary_couples(married, households)
+
+
+def celebrations_between(calendar_index, start, end):
+    """Look up every date from start to end (inclusive).
     
-    # Anniversary section
-    if anniversaries:
-        content += "Aniversario\n"
-        for couple in anniversaries:
-            content += f"{couple['name']}\n"
+    Returns:
+        list: (date, birthdays, anniversaries) tuples for dates with celebrations
+    """
+    results = []
+    date = start
+    while date <= end:
+        birthdays, anniversaries = celebrations_for_date(calendar_index, date)
+        if birthdays or anniversaries:
+            results.append((date, birthdays, anniversaries))
+        date += timedelta(days=1)
+    return results
+
+
+def format_celebrations_report(entries):
+    """Format celebrations_between() results as a plain-text digest."""
+    lines = []
+    for date, birthdays, anniversaries in entries:
+        lines.append(f"{MONTHS_ES[date.month]} {date.day}, {date.year}")
+        lines.extend(f"  🎂 {person['name']}" for person in birthdays)
+        lines.extend(f"  💍 {couple['name']}" for couple in anniversaries)
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=64)
+def load_font(path, size):
+    """Load a TrueType font, reusing the parsed font for repeated (path, size) pairs."""
+    _import_pil()
+    with _timed_init("load fonts"):
+        return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=4)
+def _decode_template(path, mtime):
+    _import_pil()
+    with _timed_init(f"decode template {os.path.basename(path)}"):
+        img = Image.open(path)
+        img.load()
+    return img
+
+
+def load_template(path):
+    """Return the decoded template image, decoding it only once per file version.
     
-    # Add date at bottom
-    today = datetime.now()
-    month_es = MONTHS_ES[today.month]
-    date_str = f"{month_es} {today.day}, {today.year}"
-    content += f"\n{date_str}"
+    The cached image is shared; callers must draw on a copy.
+    """
+    return _decode_template(path, os.path.getmtime(path))
+
+
+_SECTION_HEADERS = {"Cumpleaños", "Aniversario"}
+_LAYOUT_REFERENCE_SIZE = 100  # Lines are measured once at this size and scaled
+_HEADER_SPACING = 12  # Spacing after section headers
+_NAME_SPACING = 15    # Normal spacing between names
+_BLANK_SPACING = 35   # Extra spacing between sections
+
+# FreeType faces are not thread-safe and the loaded fonts are shared, so
+# measuring and drawing text take turns; pages only encode concurrently
+_FONT_DRAW_LOCK = threading.Lock()
+
+
+def _postcard_fonts(base_size):
+    """Load the section, name and date fonts at sizes relative to the base size."""
+    _import_pil()
+    try:
+        return (load_font(FONT_BOLD_PATH, int(base_size * 1.2)),
+                load_font(FONT_REGULAR_PATH, base_size),
+                load_font(FONT_REGULAR_PATH, int(base_size * 0.9)))
+    except Exception as e:
+        print(f"⚠️ Could not load Lora fonts, using default: {e}")
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+def _text_area(size):
+    """Safe text area (avoiding template title, footer, and side edges).
     
-    # Use felicidades.png as the base template
-    template_path = os.path.join(TEMPLATE_DIR, "felicidades.png")
+    Returns:
+        tuple: (x_margin, y_start, y_end) in pixels
+    """
+    W, H = size
+    return int(W * 0.05), int(H * 0.25), int(H * 0.80)
+
+
+def layout_postcard(template_path, text):
+    """Split postcard text into pages and columns at the largest fitting font size.
     
-    if overlay_text_on_template(template_path, content, output_filename):
-        print(f"✓ Generated {output_filename}")
-        return True
+    Every line is measured once at a reference size; widths and heights at
+    other sizes are scaled from those metrics, so trying sizes, column
+    counts and page breaks never measures text again. Names are never
+    dropped: when they do not fit on one page at MIN_FONT_SIZE they flow
+    into more columns and then onto more pages, and the font is as large as
+    that page count allows.
+    
+    Args:
+        template_path: Path of the template image
+        text: Lines to render; the last line is the date
+    
+    Returns:
+        list: One dict per page with 'columns' (lists of lines),
+            'base_size' and 'date'
+    """
+    W, H = load_template(template_path).size
+    x_margin, y_start, y_end = _text_area((W, H))
+    available_width = W - (2 * x_margin)
+    available_height = y_end - y_start
+    
+    lines = text.split('\n')
+    date_line = lines.pop() if lines and lines[-1].strip() else ""
+    while lines and not lines[-1].strip():
+        lines.pop()
+    
+    # Line metrics at the reference size; "Ag" gives a consistent line height
+    ref = _LAYOUT_REFERENCE_SIZE
+    section_font, name_font, _ = _postcard_fonts(ref)
+    draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+    
+    def _measure(line, font):
+        bbox = draw.textbbox((0, 0), line, font=font)
+        return bbox[2] - bbox[0], bbox[3] - bbox[1]
+    
+    with _FONT_DRAW_LOCK:
+        section_h = _measure("Ag", section_font)[1] / ref
+        name_h = _measure("Ag", name_font)[1] / ref
+        widest = max((_measure(line, section_font if line in _SECTION_HEADERS else name_font)[0]
+                      for line in set(lines) if line.strip()), default=0) / ref
+    
+    def _height(line, size):
+        if not line.strip():
+            return _BLANK_SPACING
+        if line in _SECTION_HEADERS:
+            return section_h * size + _HEADER_SPACING
+        return name_h * size + _NAME_SPACING
+    
+    def _paginate(size, columns, check_width=True):
+        """Flow the lines into columns and pages; None if a line is too wide."""
+        column_width = (available_width - x_margin * (columns - 1)) / columns
+        # Scaled widths are estimates (hinting), so keep a small safety margin
+        if check_width and widest * size > column_width * 0.98:
+            return None
+        
+        pages, page, column, used, header = [], [], [], 0, None
+        for line in lines:
+            h = _height(line, size)
+            if not line.strip() and not column:
+                continue
+            # Keep a section header together with its first name
+            needed = h
+            if line in _SECTION_HEADERS:
+                needed += name_h * size + _NAME_SPACING
+            if column and used + needed > available_height:
+                while column and not column[-1].strip():
+                    column.pop()
+                page.append(column)
+                if len(page) == columns:
+                    pages.append(page)
+                    page = []
+                column, used = [], 0
+                if not line.strip():
+                    continue
+                # Continuation pages repeat the current section header
+                if not page and header and line not in _SECTION_HEADERS:
+                    column.append(header)
+                    used += _height(header, size)
+            if line in _SECTION_HEADERS:
+                header = line
+            column.append(line)
+            used += h
+        if column or not pages:
+            page.append(column)
+        if page:
+            pages.append(page)
+        return pages
+    
+    best = None
+    for columns in range(1, POSTCARD_MAX_COLUMNS + 1):
+        pages = _paginate(MIN_FONT_SIZE, columns)
+        if pages is None:
+            continue
+        # Pages only grow with the font size, so binary search the largest
+        # size that keeps this page count
+        size, lo, hi = MIN_FONT_SIZE, MIN_FONT_SIZE + 1, ref
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            candidate = _paginate(mid, columns)
+            if candidate is not None and len(candidate) <= len(pages):
+                size, pages = mid, candidate
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        key = (len(pages), -size, columns)
+        if best is None or key < best[0]:
+            best = (key, size, pages)
+    
+    if best is None:
+        # A single name is wider than the card even at the smallest size
+        size, pages = MIN_FONT_SIZE, _paginate(MIN_FONT_SIZE, 1, check_width=False)
     else:
-        print(f"❌ Failed to generate {output_filename}")
-        return False
+        _, size, pages = best
+    
+    return [
+        {
+            'columns': columns,
+            'base_size': size,
+            'date': f"{date_line} ({number}/{len(pages)})" if date_line and len(pages) > 1 else date_line,
+        }
+        for number, columns in enumerate(pages, 1)
+    ]
 
-def main():
-    print("=" * 60)
-    print("CELEBRATION POSTCARD GENERATOR")
-    print("=" * 60)
 
-    print("\n[1] Fetching data from Planning Center...")
+def render_postcard_page(template_path, page):
+    """Draw one page from layout_postcard() on the template.
     
-    try:
-        birthdays = get_birthdays_today()
-        anniversaries = get_anniversaries_today()
+    Args:
+        template_path: Path of the template image
+        page: Page dict from layout_postcard()
+    
+    Returns:
+        bytes: The JPEG-encoded page
+    """
+    layout_started = time.perf_counter()
+    
+    img = load_template(template_path).copy()
+    draw = ImageDraw.Draw(img)
+    W, H = img.size
+    x_margin, y_start, y_end = _text_area(img.size)
+    columns = page['columns']
+    column_width = (W - (2 * x_margin) - x_margin * (len(columns) - 1)) / len(columns)
+    
+    with _FONT_DRAW_LOCK:
+        section_font, name_font, date_font = _postcard_fonts(page['base_size'])
         
-        birthday_count = len(birthdays)
-        anniversary_count = len(anniversaries)
+        # Standard line heights for consistency across all lines
+        ref_bbox_section = draw.textbbox((0, 0), "Ag", font=section_font)
+        section_h = ref_bbox_section[3] - ref_bbox_section[1]
+        ref_bbox_name = draw.textbbox((0, 0), "Ag", font=name_font)
+        name_h = ref_bbox_name[3] - ref_bbox_name[1]
         
-        print(f"✓ Found {birthday_count} birthday(s) and {anniversary_count} anniversary(ies)")
+        def _line_style(line):
+            """Return (font, height, spacing_after, color); font is None for blank lines."""
+            if not line.strip():
+                return None, 0, _BLANK_SPACING, None
+            if line in _SECTION_HEADERS:
+                return section_font, section_h, _HEADER_SPACING, SECTION_HEADER_COLOR
+            return name_font, name_h, _NAME_SPACING, TEXT_COLOR
         
-        # Check if we have any celebrations
-        if birthday_count > 0 or anniversary_count > 0:
-            print("\n[2] Generating combined postcard...")
-            # Generate combined postcard
-            output_file = "combined_celebrations.jpg"
-            if generate_combined_postcard(birthdays, anniversaries, output_file):
-                # Upload media to WhatsApp
-                media_id = upload_media_to_whatsapp(output_file)
-                
-                if media_id:
-                    # Send using congratulation_msg template (no body params, just image header)
-                    print(f"\n[3] Sending via WhatsApp template '{WA_TEMPLATE_CONGRATULATION}'...")
-                    send_whatsapp_template(
-                        template_name=WA_TEMPLATE_CONGRATULATION,
-                        media_id=media_id
-                    )
-                else:
-                    print("❌ Failed to upload media, sending notification instead")
-                    send_whatsapp_template(
-                        template_name=WA_TEMPLATE_NOTIFICATION,
-                        parameters=["Error uploading celebration postcard"]
-                    )
-            else:
-                # Failed to generate postcard
-                send_whatsapp_template(
-                    template_name=WA_TEMPLATE_NOTIFICATION,
-                    parameters=["Error generating celebration postcard"]
-                )
-        else:
-            # No celebrations found
-            print("\n[2] No celebrations found for today")
-            send_whatsapp_template(
+        # Center the tallest column vertically within the safe area; the
+        # other columns share its top so rows line up
+        total_content_height = max(
+            sum(h + spacing for _, h, spacing, _ in map(_line_style, column)) for column in columns
+        )
+        y_top = max(y_start, y_start + (y_end - y_start - total_content_height) / 2)
+        
+        for index, column in enumerate(columns):
+            x_center = x_margin + index * (column_width + x_margin) + column_width / 2
+            y_offset = y_top
+            for line in column:
+                font, h, spacing_after, color = _line_style(line)
+                if font is not None:
+                    bbox = draw.textbbox((0, 0), line, font=font)
+                    draw.text((x_center - (bbox[2] - bbox[0]) / 2, y_offset), line, font=font, fill=color)
+                y_offset += h + spacing_after
+        
+        # Render date at fixed position above "Salmo 103" (around 82% of height)
+        if page['date']:
+            bbox = draw.textbbox((0, 0), page['date'], font=date_font)
+            x_pos = (W - (bbox[2] - bbox[0])) / 2
+            draw.text((x_pos, int(H * 0.82)), page['date'], font=date_font, fill=TEXT_COLOR)
+    
+    METRICS.record('layout', time.perf_counter() - layout_started)
+    
+    with METRICS.stage('encode'):
+        return encode_postcard(img)
+
+
+def encode_postcard(img):
+    """Encode an image as the smallest JPEG that still looks like the original.
+    
+    Images wider than POSTCARD_MAX_WIDTH are downscaled first. Then the
+    highest quality between POSTCARD_MIN_QUALITY and POSTCARD_MAX_QUALITY
+    whose file fits in POSTCARD_MAX_BYTES is found by binary search. Usually
+    the first attempt at the maximum quality already fits. If nothing fits,
+    the minimum quality is used, so text stays crisp at the cost of size.
+    
+    Args:
+        img: Rendered Pillow image
+    
+    Returns:
+        bytes: The JPEG-encoded image
+    """
+    img = img.convert('RGB')
+    if POSTCARD_MAX_WIDTH and img.width > POSTCARD_MAX_WIDTH:
+        height = round(img.height * POSTCARD_MAX_WIDTH / img.width)
+        img = img.resize((POSTCARD_MAX_WIDTH, height), Image.LANCZOS)
+    
+    def _encode(quality):
+        METRICS.incr('encode_attempts')
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True, progressive=POSTCARD_PROGRESSIVE)
+        return buffer.getvalue()
+    
+    data = _encode(POSTCARD_MAX_QUALITY)
+    if not POSTCARD_MAX_BYTES or len(data) <= POSTCARD_MAX_BYTES:
+        return data
+    
+    fitting = None
+    lo, hi = POSTCARD_MIN_QUALITY, POSTCARD_MAX_QUALITY - 1
+    while lo <= hi:
+        quality = (lo + hi) // 2
+        data = _encode(quality)
+        if len(data) <= POSTCARD_MAX_BYTES:
+            fitting = data
+            lo = quality + 1
+        else:
+            hi = quality - 1
+    
+    if fitting is None:
+        # Every attempt was too big, so the last one was the minimum quality
+        print(f"⚠️ Postcard is {len(data) // 1024} KB even at quality {POSTCARD_MIN_QUALITY}, "
+              f"over the {POSTCARD_MAX_BYTES // 1024} KB budget")
+        return data
+    return fitting
+
+
+def render_postcard_pages(template_path, text):
+    """Lay out the postcard text and render every page, in parallel.
+    
+    Args:
+        template_path: Path of the template image
+        text: Lines to render; the last line is the date
+    
+    Returns:
+        list: JPEG bytes for each page, or None on failure
+    """
+    try:
+        if not os.path.exists(template_path):
+            print(f"❌ Template not found: {template_path}")
+            return None
+        
+        pages = layout_postcard(template_path, text)
+        if len(pages) == 1:
+            return [render_postcard_page(template_path, pages[0])]
+        
+        print(f"ℹ️ Too many names for one page, splitting into {len(pages)} pages")
+        with ThreadPoolExecutor(max_workers=min(len(pages), os.cpu_count() or 1)) as executor:
+            return list(executor.map(_in_context(functools.partial(render_postcard_page, template_path)), pages))
+    except Exception as e:
+        print(f"❌ Error in Pillow overlay: {e}")
+        return None
+
+def _cached_media_id(content_hash):
+    """Return a still-valid media ID previously uploaded for this content, if any."""
+    try:
+        with closing(open_cache_db()) as conn:
+            row = conn.execute(
+                "SELECT media_id, uploaded_at FROM media_cache WHERE content_hash = ? AND phone_number_id = ?",
+                (content_hash, setting('WHATSAPP_PHONE_NUMBER_ID'))
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Media cache unavailable: {e}")
+        return None
+    if row and time.time() - row['uploaded_at'] < WA_MEDIA_CACHE_DAYS * 86400:
+        return row['media_id']
+    return None
+
+
+def _remember_media_id(content_hash, media_id):
+    try:
+        with closing(open_cache_db()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO media_cache (content_hash, phone_number_id, media_id, uploaded_at) VALUES (?, ?, ?, ?)",
+                (content_hash, setting('WHATSAPP_PHONE_NUMBER_ID'), media_id, time.time())
+            )
+            conn.execute("DELETE FROM media_cache WHERE uploaded_at < ?", (time.time() - WA_MEDIA_CACHE_DAYS * 86400,))
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Could not cache media ID: {e}")
+
+
+def upload_media_to_whatsapp(image_bytes, filename="combined_celebrations.jpg", mime_type=None, use_cache=True):
+    """Upload media to WhatsApp to get a media ID.
+    
+    Media IDs are cached by a SHA-256 of the content, so re-sending identical
+    bytes within WA_MEDIA_CACHE_DAYS skips the upload entirely.
+    
+    Args:
+        image_bytes: Encoded image, uploaded straight from memory
+        filename: Name reported for the upload
+        mime_type: MIME type of the image (guessed from filename if omitted)
+        use_cache: Reuse (and record) media IDs for identical content
+    """
+    content_hash = hashlib.sha256(image_bytes).hexdigest()
+    if use_cache:
+        media_id = _cached_media_id(content_hash)
+        if media_id:
+            print(f"✓ Reusing previously uploaded media {media_id}")
+            return media_id
+    
+    url = f"{WHATSAPP_GRAPH_URL}/{setting('WHATSAPP_PHONE_NUMBER_ID')}/media"
+    headers = {
+        "Authorization": f"Bearer {setting('WHATSAPP_API_TOKEN')}"
+    }
+    
+    try:
+        if not mime_type:
+            import mimetypes
+            mime_type = mimetypes.guess_type(filename)[0]
+        files = {
+            'file': (filename, image_bytes, mime_type),
+            'messaging_product': (None, 'whatsapp'),
+            'type': (None, mime_type)
+        }
+        response = http_request('POST', url, headers=headers, files=files, timeout=60)
+            
+        if response.status_code == 200:
+            media_id = response.json().get('id')
+            if media_id and use_cache:
+                _remember_media_id(content_hash, media_id)
+            return media_id
+        else:
+            logging.error(f"Error uploading media: {response.status_code}")
+            return None
+    except requests.RequestException as e:
+        logging.error(f"Exception in media upload: {e}")
+        return None
+
+def _name_sort_key(entry):
+    name = entry['name'] or ''
+    return name.casefold(), name
+
+
+def build_postcard_text(birthdays, anniversaries, date=None):
+    """Compose the postcard text: one section per celebration type, date last.
+    
+    Names are sorted within each section, so the same roster always yields
+    the same text (and pre-render key), whether it was read from the API or
+    from the people cache.
+    
+    Args:
+        birthdays: List of birthday people
+        anniversaries: List of anniversary couples
+        date: Date printed on the postcard (defaults to today)
+    """
+    content = ""
+    
+    # Birthday section
+    if birthdays:
+        content += "Cumpleaños\n"
+        for person in sorted(birthdays, key=_name_sort_key):
+            content += f"{person['name']}\n"
+    
+    # Add spacing between sections if both exist
+    if birthdays and anniversaries:
+        content += "\n\n"  # Double blank line for clear section separation
+    
+    # Anniversary section
+    if anniversaries:
+        content += "Aniversario\n"
+        for couple in sorted(anniversaries, key=_name_sort_key):
+            content += f"{couple['name']}\n"
+    
+    # Add date at bottom
+    today = date or datetime.now()
+    month_es = MONTHS_ES[today.month]
+    date_str = f"{month_es} {today.day}, {today.year}"
+    content += f"\n{date_str}"
+    return content
+
+
+def prerendered_postcard_path(content, date):
+    """Path of the pre-rendered postcard for this exact text, template and renderer.
+    
+    The key changes whenever the roster, the template file, the encoding
+    settings or POSTCARD_RENDER_VERSION change, so a stale postcard is never
+    reused.
+    """
+    template_path = os.path.join(TEMPLATE_DIR, "felicidades.png")
+    try:
+        stat = os.stat(template_path)
+        template_key = f"{stat.st_mtime_ns}:{stat.st_size}"
+    except OSError:
+        template_key = "missing"
+    encoding_key = (f"{POSTCARD_MAX_BYTES}:{POSTCARD_MIN_QUALITY}:{POSTCARD_MAX_QUALITY}:"
+                    f"{POSTCARD_MAX_WIDTH}:{POSTCARD_PROGRESSIVE}")
+    digest = hashlib.sha256(
+        f"{POSTCARD_RENDER_VERSION}\0{template_key}\0{encoding_key}\0{content}".encode('utf-8')
+    ).hexdigest()
+    return os.path.join(setting('PRERENDER_DIR'), f"{date:%Y-%m-%d}-{digest[:16]}.jpg")
+
+
+def _write_file_atomic(path, data):
+    """Write bytes via a temporary file so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def postcard_page_path(path, page_number):
+    """Path of page N (1-based) of a postcard saved as path; page 1 is path itself."""
+    if page_number == 1:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{page_number}{ext}"
+
+
+def _save_postcard_pages(path, pages):
+    """Save every page, page 1 last so its presence means the set is complete."""
+    for page_number in range(len(pages), 0, -1):
+        _write_file_atomic(postcard_page_path(path, page_number), pages[page_number - 1])
+
+
+def _load_postcard_pages(path):
+    """Load the pages saved by _save_postcard_pages(), or None if page 1 is missing."""
+    pages = []
+    try:
+        while True:
+            with open(postcard_page_path(path, len(pages) + 1), 'rb') as f:
+                pages.append(f.read())
+    except OSError:
+        pass
+    return pages or None
+
+
+def generate_combined_postcard(birthdays, anniversaries, output_filename=None, date=None, use_prerendered=False):
+    """Generate the postcard combining birthdays and anniversaries.
+    
+    Pages are rendered to in-memory JPEGs; nothing touches the disk unless
+    output_filename is given. Most days fit on one page; big days are split
+    across several rather than dropping names.
+    
+    Args:
+        birthdays: List of birthday people
+        anniversaries: List of anniversary couples
+        output_filename: Optional file to also save the postcard to (page N
+            goes to name-N.jpg)
+        date: Date printed on the postcard (defaults to today)
+        use_prerendered: Return the postcard rendered ahead of time by
+            --prerender if it matches this roster exactly
+    
+    Returns:
+        list: The JPEG-encoded pages, in order, or None on failure
+    """
+    date = date or datetime.now()
+    content = build_postcard_text(birthdays, anniversaries, date)
+    
+    pages = None
+    if use_prerendered:
+        pages = _load_postcard_pages(prerendered_postcard_path(content, date))
+        if pages:
+            print(f"✓ Using pre-rendered postcard ({len(pages)} page(s), {sum(map(len, pages)) // 1024} KB)")
+    
+    if pages is None:
+        # Use felicidades.png as the base template
+        template_path = os.path.join(TEMPLATE_DIR, "felicidades.png")
+        
+        pages = render_postcard_pages(template_path, content)
+        if not pages:
+            print("❌ Failed to generate postcard")
+            return None
+        
+        print(f"✓ Generated postcard ({len(pages)} page(s), {sum(map(len, pages)) // 1024} KB)")
+    
+    if output_filename:
+        try:
+            _save_postcard_pages(output_filename, pages)
+        except OSError as e:
+            logging.error(f"Could not save postcard to {output_filename}: {e}")
+    return pages
+
+def _warm_render_worker():
+    """Process pool initializer: decode the template and load the layout fonts once per worker."""
+    template_path = os.path.join(TEMPLATE_DIR, "felicidades.png")
+    if os.path.exists(template_path):
+        load_template(template_path)
+        _postcard_fonts(_LAYOUT_REFERENCE_SIZE)
+
+
+def _render_postcard_job(job):
+    date, birthdays, anniversaries, output_filename = job
+    return date, generate_combined_postcard(birthdays, anniversaries, output_filename, date=date) is not None
+
+
+def render_postcards_for_range(start, end, out_dir="output", workers=None):
+    """Render one postcard per date with celebrations, in parallel worker processes.
+    
+    Celebrants come from the local people cache. Each worker process keeps
+    its own decoded template and font cache.
+    
+    Args:
+        start: First date to render
+        end: Last date to render (inclusive)
+        out_dir: Directory receiving one celebraciones_YYYY-MM-DD.jpg per date
+        workers: Number of processes (defaults to RENDER_WORKERS)
+    
+    Returns:
+        list: Dates whose postcard failed to render
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [
+        (date, birthdays, anniversaries, os.path.join(out_dir, f"celebraciones_{date:%Y-%m-%d}.jpg"))
+        for date, birthdays, anniversaries in celebrations_between(get_celebration_calendar(), start, end)
+    ]
+    if not jobs:
+        print("No celebrations in this period")
+        return []
+    
+    failed = _render_in_pool(jobs, workers)
+    print(f"✓ Rendered {len(jobs) - len(failed)}/{len(jobs)} postcard(s) into {out_dir}")
+    return failed
+
+
+def _render_in_pool(jobs, workers=None):
+    """Run render jobs across a process pool; returns the dates that failed."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    workers = min(workers or RENDER_WORKERS, len(jobs))
+    print(f"Rendering {len(jobs)} postcard(s) with {workers} worker(s)...")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_render_worker) as executor:
+        results = list(executor.map(_render_postcard_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return [date for date, ok in results if not ok]
+
+
+def prerender_upcoming_postcards(days, workers=None):
+    """Render the postcards for today and the next days ahead of the daily send.
+    
+    Postcards land in PRERENDER_DIR keyed by date and content hash; main()
+    picks one up only if the fresh roster produces exactly the same text.
+    Postcards for past dates are removed.
+    
+    Args:
+        days: Number of days to render, starting today
+        workers: Number of processes (defaults to RENDER_WORKERS)
+    
+    Returns:
+        list: Dates whose postcard failed to render
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    prerender_dir = setting('PRERENDER_DIR')
+    os.makedirs(prerender_dir, exist_ok=True)
+    for name in os.listdir(prerender_dir):
+        if name[:10] < f"{today:%Y-%m-%d}":
+            os.remove(os.path.join(prerender_dir, name))
+    
+    jobs = []
+    for date, birthdays, anniversaries in celebrations_between(
+            get_celebration_calendar(), today, today + timedelta(days=days - 1)):
+        path = prerendered_postcard_path(build_postcard_text(birthdays, anniversaries, date), date)
+        if not os.path.exists(path):
+            jobs.append((date, birthdays, anniversaries, path))
+    if not jobs:
+        print("✓ Pre-rendered postcards are up to date")
+        return []
+    
+    failed = _render_in_pool(jobs, workers)
+    print(f"✓ Pre-rendered {len(jobs) - len(failed)}/{len(jobs)} postcard(s)")
+    return failed
+
+
+# =============================================================================
+# RUN JOURNAL / OUTBOX
+# =============================================================================
+#
+# One `runs` row per day moves through fetched -> rendered -> uploaded ->
+# sending -> done, and `outbox` holds one row per page and recipient
+# (pending -> sending -> sent/failed/unknown). Rendered pages are kept in the
+# pre-render cache, so a restart never repeats finished work. Only `failed`
+# messages, which WhatsApp certainly did not act on, are sent again; an
+# ambiguous response or a message left in `sending` by a crash becomes
+# `unknown` and is never resent, because it may already have been delivered.
+
+def _run_key(date):
+    return f"{date:%Y-%m-%d}"
+
+
+def open_run_journal(date, roster_hash):
+    """Load (or start) the journal of the day's postcard run.
+    
+    A run that has not started sending is restarted if the roster changed
+    since; once sends have started, the journaled postcard is finished as is.
+    
+    Args:
+        date: Day of the run
+        roster_hash: SHA-256 of the postcard text built from today's roster
+    
+    Returns:
+        dict: The journal (status, roster_hash, render_hash, media_ids), or
+        None if the journal database is unavailable
+    """
+    key = _run_key(date)
+    try:
+        with closing(open_cache_db()) as conn, conn:
+            conn.execute("DELETE FROM runs WHERE run_date < ?",
+                         (_run_key(date - timedelta(days=OUTBOX_KEEP_DAYS)),))
+            conn.execute("DELETE FROM outbox WHERE run_date < ?",
+                         (_run_key(date - timedelta(days=OUTBOX_KEEP_DAYS)),))
+            row = conn.execute("SELECT * FROM runs WHERE run_date = ?", (key,)).fetchone()
+            if row and row['roster_hash'] != roster_hash:
+                if row['status'] in ('sending', 'done'):
+                    print("⚠️ Roster changed since today's postcard started sending; finishing the journaled postcard")
+                else:
+                    conn.execute("DELETE FROM outbox WHERE run_date = ?", (key,))
+                    row = None
+            if row is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO runs (run_date, roster_hash, status, updated_at) VALUES (?, ?, 'fetched', ?)",
+                    (key, roster_hash, time.time())
+                )
+                row = conn.execute("SELECT * FROM runs WHERE run_date = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Run journal unavailable: {e}")
+        return None
+    return {
+        'status': row['status'],
+        'roster_hash': row['roster_hash'],
+        'render_hash': row['render_hash'],
+        'media_ids': json.loads(row['media_ids']) if row['media_ids'] else None,
+    }
+
+
+def _update_run(date, **fields):
+    """Record the result of a finished step in the day's journal."""
+    fields['updated_at'] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with closing(open_cache_db()) as conn, conn:
+        conn.execute(f"UPDATE runs SET {assignments} WHERE run_date = ?", (*fields.values(), _run_key(date)))
+
+
+def journal_render(date, pages):
+    """Record the rendered postcard (its pages already sit in the pre-render cache)."""
+    digest = hashlib.sha256()
+    for page in pages:
+        digest.update(hashlib.sha256(page).digest())
+    _update_run(date, render_hash=digest.hexdigest(), status='rendered')
+
+
+def journal_upload(date, media_ids, recipients):
+    """Record the uploaded media and queue one message per page and recipient."""
+    key = _run_key(date)
+    now = time.time()
+    recipients = [r for r in dict.fromkeys(''.join(filter(str.isdigit, r)) for r in recipients) if r]
+    with closing(open_cache_db()) as conn, conn:
+        conn.execute(
+            "UPDATE runs SET media_ids = ?, status = 'uploaded', updated_at = ? WHERE run_date = ?",
+            (json.dumps(media_ids), now, key)
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO outbox (run_date, page, recipient, media_id, status, updated_at) "
+            "VALUES (?, ?, ?, ?, 'pending', ?)",
+            [(key, page, number, media_id, now)
+             for page, media_id in enumerate(media_ids, 1) for number in recipients]
+        )
+
+
+def _set_outbox_status(key, page, number, status, error=None):
+    with closing(open_cache_db()) as conn, conn:
+        conn.execute(
+            "UPDATE outbox SET status = ?, last_error = ?, updated_at = ?, "
+            "attempts = attempts + (CASE WHEN ? = 'sending' THEN 1 ELSE 0 END) "
+            "WHERE run_date = ? AND page = ? AND recipient = ?",
+            (status, error, time.time(), status, key, page, number)
+        )
+
+
+def drain_outbox(date):
+    """Send every pending message of the day's run, page by page, retrying failures.
+    
+    Each message is marked `sending` before the request and `sent`, `failed`
+    or `unknown` right after (see deliver_whatsapp_template()), so a crash
+    loses at most the knowledge of one in-flight message per worker. Unknown
+    and interrupted messages are reported and not resent. Failed messages
+    are retried with backoff, up to OUTBOX_MAX_ATTEMPTS times per drain. A
+    message that cannot be marked `sending` is not sent.
+    
+    Args:
+        date: Day of the run
+    
+    Returns:
+        dict: Counts of 'sent', 'failed' and 'unknown' messages for the run,
+        or None if the journal became unavailable (the drain stops, since
+        sending without it could message someone twice)
+    """
+    try:
+        return _drain_outbox(date)
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Run journal unavailable, stopped sending: {e}")
+        return None
+
+
+def _drain_outbox(date):
+    key = _run_key(date)
+    _update_run(date, status='sending')
+    
+    with closing(open_cache_db()) as conn, conn:
+        interrupted = conn.execute(
+            "SELECT page, recipient FROM outbox WHERE run_date = ? AND status = 'sending'", (key,)
+        ).fetchall()
+        conn.execute(
+            "UPDATE outbox SET status = 'unknown', last_error = 'interrupted', updated_at = ? "
+            "WHERE run_date = ? AND status = 'sending'",
+            (time.time(), key)
+        )
+        pages = [row['page'] for row in conn.execute(
+            "SELECT DISTINCT page FROM outbox WHERE run_date = ? ORDER BY page", (key,))]
+    for row in interrupted:
+        print(f"⚠️ Page {row['page']} to {row['recipient']} may have been sent before a crash; not resending")
+    
+    pacer = TokenBucket(WA_MESSAGES_PER_SECOND, 1)
+    
+    def _send(message):
+        page, number, media_id = message
+        pacer.acquire()
+        try:
+            _set_outbox_status(key, page, number, 'sending')
+        except (sqlite3.Error, OSError) as e:
+            logging.error(f"Could not journal page {page} to {number}, not sending it: {e}")
+            return False
+        outcome = deliver_whatsapp_template(WA_TEMPLATE_CONGRATULATION, media_id=media_id, to=number)
+        error = {'failed': "send failed", 'unknown': "outcome unknown"}.get(outcome)
+        try:
+            _set_outbox_status(key, page, number, outcome, error)
+        except (sqlite3.Error, OSError) as e:
+            # The row stays `sending`, so it is reported as unknown rather than resent
+            logging.error(f"Could not journal the result of page {page} to {number}: {e}")
+        return outcome == 'sent'
+    
+    # Pages go out one after the other so every recipient gets them in order
+    for page in pages:
+        for attempt in range(OUTBOX_MAX_ATTEMPTS):
+            with closing(open_cache_db()) as conn:
+                messages = [(row['page'], row['recipient'], row['media_id']) for row in conn.execute(
+                    "SELECT page, recipient, media_id FROM outbox WHERE run_date = ? AND page = ? "
+                    "AND status IN ('pending', 'failed')",
+                    (key, page)
+                )]
+            if not messages:
+                break
+            if attempt:
+                delay = _retry_delay(None, attempt - 1)
+                print(f"   Retrying {len(messages)} message(s) in {delay:.1f}s")
+                time.sleep(delay)
+            if len(pages) > 1:
+                print(f"   Page {page}/{len(pages)}")
+            with ThreadPoolExecutor(max_workers=min(WA_MAX_CONCURRENCY, len(messages))) as executor:
+                results = list(executor.map(_in_context(_send), messages))
+            print(f"✓ Sent '{WA_TEMPLATE_CONGRATULATION}' to {sum(results)}/{len(results)} recipient(s)")
+    
+    with closing(open_cache_db()) as conn:
+        counts = dict(conn.execute(
+            "SELECT status, COUNT(*) FROM outbox WHERE run_date = ? GROUP BY status", (key,)
+        ).fetchall())
+    summary = {
+        'sent': counts.get('sent', 0),
+        'failed': counts.get('failed', 0) + counts.get('pending', 0),
+        'unknown': counts.get('unknown', 0) + counts.get('sending', 0),
+    }
+    if summary['unknown']:
+        print(f"   ⚠️ {summary['unknown']} message(s) may not have arrived; not resending them")
+    if summary['failed']:
+        print(f"   ❌ {summary['failed']} message(s) still unsent; a later run today retries them")
+    elif not summary['sent'] and not summary['unknown']:
+        print("   ❌ No messages were queued for today's postcard")
+    else:
+        try:
+            _update_run(date, status='done')
+        except (sqlite3.Error, OSError) as e:
+            # Everything went out; the next run finds nothing pending and closes the run
+            logging.error(f"Could not mark today's run as done: {e}")
+    return summary
+
+
+def resume_unfinished_run():
+    """Finish sending today's postcard if an earlier process stopped mid-way.
+    
+    Returns:
+        dict: drain_outbox() counts, or None if nothing was pending or the
+        journal is unavailable
+    """
+    today = datetime.now()
+    try:
+        with closing(open_cache_db()) as conn:
+            row = conn.execute(
+                "SELECT status FROM runs WHERE run_date = ? AND status IN ('uploaded', 'sending')",
+                (_run_key(today),)
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Run journal unavailable: {e}")
+        return None
+    if row is None:
+        return None
+    print("↻ Resuming today's unfinished postcard sends")
+    return drain_outbox(today)
+
+
+async def _in_thread(func, *args, **kwargs):
+    """Run blocking work in the default executor without stalling the event loop.
+    
+    While profiling, the work runs inline instead, because cProfile only sees
+    the thread that started it.
+    """
+    if PROFILER:
+        return func(*args, **kwargs)
+    return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def run_pipeline(full_resync=False):
+    """Fetch, render, upload and send today's postcard, overlapping independent steps.
+    
+    The birthday and anniversary fetches run concurrently. As soon as either
+    one finds someone, Pillow, the template and the layout fonts load in the
+    background, so a day without celebrations loads nothing heavy. Rendering
+    starts as soon as both rosters are in, and all pages upload at once. Sends stay
+    sequential so the pages arrive in order.
+    
+    With OUTBOX_ENABLED, every finished step is journaled, so a rerun on the
+    same day resumes where the last one stopped and never sends twice.
+    
+    Args:
+        full_resync: Discard the local people cache and download everything again
+    """
+    loop = asyncio.get_running_loop()
+    warm_renderer = None
+    
+    def _warm_up_if_celebrating(fetch):
+        nonlocal warm_renderer
+        if warm_renderer is None and not fetch.cancelled() and fetch.exception() is None and fetch.result():
+            warm_renderer = loop.run_in_executor(None, _warm_render_worker)
+    
+    if setting('PEOPLE_CACHE_ENABLED') or full_resync:
+        with METRICS.stage('cache_sync'):
+            if not await _in_thread(sync_people_cache, full_resync=full_resync):
+                print("⚠️ People cache sync failed, using last synced data")
+    
+    with METRICS.stage('pco_fetch'):
+        fetches = [asyncio.ensure_future(_in_thread(fetch))
+                   for fetch in (get_birthdays_today, get_anniversaries_today)]
+        for fetch in fetches:
+            fetch.add_done_callback(_warm_up_if_celebrating)
+        try:
+            birthdays, anniversaries = await asyncio.gather(*fetches)
+        except (requests.RequestException, ValueError) as e:
+            # A partial roster would silently leave people off the postcard
+            logging.error(f"Could not read today's celebrations from Planning Center: {e}")
+            print("❌ Planning Center lists could not be read completely, sending notification instead")
+            await _in_thread(
+                send_whatsapp_template,
+                template_name=WA_TEMPLATE_NOTIFICATION,
+                parameters=["Error fetching celebrations from Planning Center"]
+            )
+            return
+    
+    birthday_count = len(birthdays)
+    anniversary_count = len(anniversaries)
+    METRICS.set('birthdays', birthday_count)
+    METRICS.set('anniversaries', anniversary_count)
+    
+    print(f"✓ Found {birthday_count} birthday(s) and {anniversary_count} anniversary(ies)")
+    
+    # Check if we have any celebrations
+    if birthday_count == 0 and anniversary_count == 0:
+        print("\n[2] No celebrations found for today")
+        with METRICS.stage('template_send'):
+            sent = await _in_thread(
+                send_whatsapp_template,
                 template_name=WA_TEMPLATE_NOTIFICATION,
                 parameters=["No celebrations found for today"]
             )
+        METRICS.set('run_success', int(sent))
+        return
+    
+    if not any(''.join(filter(str.isdigit, number)) for number in setting('WHATSAPP_RECIPIENTS')):
+        print("\n❌ No postcard recipients configured (WHATSAPP_RECIPIENTS / TARGET_PHONE_NUMBER)")
+        return
+    
+    today = datetime.now()
+    content = build_postcard_text(birthdays, anniversaries, today)
+    journal = None
+    if OUTBOX_ENABLED:
+        journal = await _in_thread(open_run_journal, today, hashlib.sha256(content.encode('utf-8')).hexdigest())
+    if journal and journal['status'] == 'done':
+        print("\n✓ Today's postcard was already sent; nothing to do")
+        METRICS.set('run_success', 1)
+        return
+    
+    media_ids = journal['media_ids'] if journal else None
+    if media_ids:
+        print("\n[2] Resuming today's run: postcard already rendered and uploaded")
+    else:
+        print("\n[2] Generating combined postcard...")
+        # Generate combined postcard
+        with METRICS.stage('render'):
+            try:
+                if warm_renderer is not None:
+                    await warm_renderer
+            except Exception as e:
+                logging.error(f"Could not preload the renderer: {e}")
+            pages = await _in_thread(
+                generate_combined_postcard, birthdays, anniversaries, setting('POSTCARD_OUTPUT_PATH'),
+                date=today, use_prerendered=True
+            )
+        if not pages:
+            # Failed to generate postcard
+            await _in_thread(
+                send_whatsapp_template,
+                template_name=WA_TEMPLATE_NOTIFICATION,
+                parameters=["Error generating celebration postcard"]
+            )
+            return
+        if journal:
+            # Keep the pages in the pre-render cache, where a restarted run finds them
+            prerendered_path = prerendered_postcard_path(content, today)
+            try:
+                if not os.path.exists(prerendered_path):
+                    _save_postcard_pages(prerendered_path, pages)
+            except OSError as e:
+                logging.error(f"Could not keep rendered postcard for a restart: {e}")
+            try:
+                await _in_thread(journal_render, today, pages)
+            except (sqlite3.Error, OSError) as e:
+                logging.error(f"Run journal unavailable, sending without it: {e}")
+                journal = None
+        
+        METRICS.set('postcard_bytes', sum(map(len, pages)))
+        METRICS.set('postcard_pages', len(pages))
+        # Upload all pages to WhatsApp at once
+        with METRICS.stage('media_upload'):
+            media_ids = await asyncio.gather(*(
+                _in_thread(upload_media_to_whatsapp, page, filename=postcard_page_path("combined_celebrations.jpg", n))
+                for n, page in enumerate(pages, 1)
+            ))
+        
+        if not all(media_ids):
+            print("❌ Failed to upload media, sending notification instead")
+            await _in_thread(
+                send_whatsapp_template,
+                template_name=WA_TEMPLATE_NOTIFICATION,
+                parameters=["Error uploading celebration postcard"]
+            )
+            return
+        if journal:
+            try:
+                await _in_thread(journal_upload, today, media_ids, setting('WHATSAPP_RECIPIENTS'))
+            except (sqlite3.Error, OSError) as e:
+                # Nothing has been sent yet, so the unjournaled path is still safe
+                logging.error(f"Run journal unavailable, sending without it: {e}")
+                journal = None
+    
+    # Send using congratulation_msg template (no body params, just image header),
+    # one page after the other so they arrive in order
+    print(f"\n[3] Sending via WhatsApp template '{WA_TEMPLATE_CONGRATULATION}'...")
+    if journal:
+        with METRICS.stage('template_send'):
+            summary = await _in_thread(drain_outbox, today)
+        if summary is None:
+            print("❌ Could not record sends in the run journal, sending notification instead")
+            await _in_thread(
+                send_whatsapp_template,
+                template_name=WA_TEMPLATE_NOTIFICATION,
+                parameters=["Error sending celebration postcard"]
+            )
+            return
+        METRICS.set('messages_sent', summary['sent'])
+        METRICS.set('messages_failed', summary['failed'])
+        METRICS.set('run_success', int(summary['failed'] == 0 and summary['sent'] + summary['unknown'] > 0))
+        return
     
+    results = {}
+    sent = failed = 0
+    with METRICS.stage('template_send'):
+        for page_number, media_id in enumerate(media_ids, 1):
+            if len(media_ids) > 1:
+                print(f"   Page {page_number}/{len(media_ids)}")
+            page_results = await _in_thread(
+                send_template_to_recipients,
+                setting('WHATSAPP_RECIPIENTS'),
+                template_name=WA_TEMPLATE_CONGRATULATION,
+                media_id=media_id
+            )
+            sent += sum(page_results.values())
+            failed += len(page_results) - sum(page_results.values())
+            for number, ok in page_results.items():
+                results[number] = results.get(number, True) and ok
+    METRICS.set('messages_sent', sent)
+    METRICS.set('messages_failed', failed)
+    METRICS.set('run_success', int(bool(results) and all(results.values())))
+
+
+def main(full_resync=False):
+    METRICS.reset()
+    METRICS.set('run_success', 0)
+    
+    print("=" * 60)
+    print("CELEBRATION POSTCARD GENERATOR")
+    tenant = _current_tenant.get()
+    if tenant is not None:
+        print(f"Tenant: {tenant.name}")
+    print("=" * 60)
+
+    print("\n[1] Fetching data from Planning Center...")
+    
+    try:
+        asyncio.run(run_pipeline(full_resync=full_resync))
     except Exception as e:
         print(f"\n❌ Error during execution: {e}")
         # Send sanitized error notification (no internal details via WhatsApp)
@@ -569,13 +2773,397 @@ def main():
     print("\n" + "=" * 60)
     print("PROCESS COMPLETE")
     print("=" * 60)
+    METRICS.write_reports(setting('RUN_REPORT_PATH'), setting('PROMETHEUS_TEXTFILE_PATH'))
+
+# =============================================================================
+# MULTI-TENANT MODE
+# =============================================================================
+
+def _parse_text(value):
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise ValueError(f"expected a string, got {value!r}")
+    return str(value)
+
+
+def _parse_flag(value):
+    """Read a boolean the way the environment flags are read ("true", "1", "yes")."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    raise ValueError(f"expected true or false, got {value!r}")
+
+
+def _parse_recipients(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        raise ValueError(f"expected a comma-separated string or a list, got {value!r}")
+    return [number for number in (_parse_text(n).strip() for n in value) if number]
+
+
+# Tenant config keys -> (the setting each one overrides, parser for its JSON value)
+TENANT_SETTINGS = {
+    'pc_app_id': ('PLANNING_CENTER_APP_ID', _parse_text),
+    'pc_secret': ('PLANNING_CENTER_SECRET', _parse_text),
+    'pc_base_url': ('PC_BASE_URL', lambda value: _parse_text(value).rstrip('/')),
+    'anniversary_list_id': ('PC_ANNIVERSARY_LIST_ID', _parse_text),
+    'whatsapp_api_token': ('WHATSAPP_API_TOKEN', _parse_text),
+    'whatsapp_phone_number_id': ('WHATSAPP_PHONE_NUMBER_ID', _parse_text),
+    'target_phone_number': ('TARGET_PHONE_NUMBER', _parse_text),
+    'recipients': ('WHATSAPP_RECIPIENTS', _parse_recipients),
+    'people_cache_enabled': ('PEOPLE_CACHE_ENABLED', _parse_flag),
+    'cache_db_path': ('CACHE_DB_PATH', _parse_text),
+    'prerender_dir': ('PRERENDER_DIR', _parse_text),
+    'postcard_output_path': ('POSTCARD_OUTPUT_PATH', _parse_text),
+    'run_report_path': ('RUN_REPORT_PATH', _parse_text),
+    'prometheus_textfile_path': ('PROMETHEUS_TEXTFILE_PATH', _parse_text),
+}
+_TENANT_REQUIRED = ['pc_app_id', 'pc_secret', 'whatsapp_api_token', 'whatsapp_phone_number_id', 'target_phone_number']
+
+
+class Tenant:
+    """One congregation in a multi-tenant run.
+    
+    Holds the settings it overrides plus its own Planning Center rate
+    limiter and run metrics. Fonts, the template and the HTTP connection
+    pool are shared by all tenants; the people, HTTP and media caches and
+    the run journal live in the tenant's own CACHE_DB_PATH.
+    """
+
+    def __init__(self, name, settings):
+        self.name = name
+        self.settings = settings
+        self.metrics = RunMetrics(labels={'tenant': name})
+        base_url = settings.get('PC_BASE_URL', PC_BASE_URL)
+        self.rate_limiters = {base_url: TokenBucket(PC_RATE_LIMIT, PC_RATE_PERIOD)}
+
+
+def _tenant_path(path, name):
+    """Derive a per-tenant file name, e.g. data/cache.db -> data/cache-<name>.db."""
+    root, ext = os.path.splitext(path)
+    return f"{root}-{name}{ext}"
+
+
+def load_tenants(path):
+    """Read the tenants file.
+    
+    The file holds a JSON list of objects, each with a unique "name" plus
+    any TENANT_SETTINGS keys; omitted keys fall back to the environment.
+    Values written as "$VAR" are read from the environment, so secrets can
+    stay out of the file. Values are parsed like the environment variables
+    they replace, e.g. "false" turns people_cache_enabled off. Unless configured explicitly, every tenant gets its
+    own people cache, pre-render directory and output/report files next to
+    the global ones (e.g. data/cache-<name>.db).
+    
+    Returns:
+        list: Tenant objects, in file order
+    
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is malformed or a tenant lacks a required setting
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("the tenants file must contain a JSON list")
+    
+    tenants = []
+    for entry in entries:
+        name = str(entry.get('name') or '')
+        if not re.fullmatch(r'[A-Za-z0-9_-]+', name) or any(t.name == name for t in tenants):
+            raise ValueError(f"tenant names must be unique and use only letters, digits, - and _ (got {name!r})")
+        unknown = set(entry) - set(TENANT_SETTINGS) - {'name'}
+        if unknown:
+            raise ValueError(f"tenant {name}: unknown settings {', '.join(sorted(unknown))}")
+        
+        defaults = default_settings()
+        settings = {}
+        for key, value in entry.items():
+            if key == 'name':
+                continue
+            if isinstance(value, str) and value.startswith('$'):
+                value = os.getenv(value[1:], '')
+            setting_name, parse = TENANT_SETTINGS[key]
+            try:
+                settings[setting_name] = parse(value)
+            except ValueError as e:
+                raise ValueError(f"tenant {name}: {key}: {e}") from None
+        
+        missing = [key for key in _TENANT_REQUIRED
+                   if not settings.get(TENANT_SETTINGS[key][0], defaults[TENANT_SETTINGS[key][0]])]
+        if missing:
+            raise ValueError(f"tenant {name}: missing {', '.join(missing)}")
+        
+        if not settings.get('WHATSAPP_RECIPIENTS', True):
+            # An empty list means "just the target", as in the environment
+            del settings['WHATSAPP_RECIPIENTS']
+        if 'WHATSAPP_RECIPIENTS' not in settings and 'TARGET_PHONE_NUMBER' in settings:
+            settings['WHATSAPP_RECIPIENTS'] = [settings['TARGET_PHONE_NUMBER']]
+        
+        settings.setdefault('CACHE_DB_PATH', _tenant_path(defaults['CACHE_DB_PATH'], name))
+        settings.setdefault('PRERENDER_DIR', os.path.join(defaults['PRERENDER_DIR'], name))
+        for key in ('POSTCARD_OUTPUT_PATH', 'RUN_REPORT_PATH', 'PROMETHEUS_TEXTFILE_PATH'):
+            if key not in settings and defaults[key]:
+                settings[key] = _tenant_path(defaults[key], name)
+        
+        tenants.append(Tenant(name, settings))
+    return tenants
+
+
+def run_for_tenants(tenants, job, concurrency=None):
+    """Run job() once per tenant, concurrently, with that tenant's settings active.
+    
+    Each tenant runs in its own copy of the context, so setting(), METRICS
+    and the rate limiters resolve to that tenant in its thread and in every
+    task or worker thread it starts.
+    
+    Args:
+        tenants: Tenant objects from load_tenants()
+        job: Callable taking no arguments
+        concurrency: Tenants run at once (defaults to TENANT_CONCURRENCY)
+    
+    Returns:
+        dict: Tenant name to job result (None if the job raised)
+    """
+    def _run(tenant):
+        _current_tenant.set(tenant)
+        try:
+            return job()
+        except Exception as e:
+            logging.error(f"Tenant {tenant.name} failed: {e}")
+            return None
+    
+    workers = min(concurrency or TENANT_CONCURRENCY, len(tenants))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda tenant: contextvars.copy_context().run(_run, tenant), tenants)
+        return dict(zip((tenant.name for tenant in tenants), results))
+
+
+# =============================================================================
+# DAEMON MODE
+# =============================================================================
+
+_WEEKDAYS = ['MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+
+
+def parse_schedule(spec):
+    """Parse 'HH:MM' (daily) or 'MON HH:MM' (weekly) into (weekday or None, hour, minute)."""
+    parts = spec.split()
+    weekday = None
+    if len(parts) == 2:
+        weekday = _WEEKDAYS.index(parts[0][:3].upper())
+        parts = parts[1:]
+    if len(parts) != 1:
+        raise ValueError(f"Invalid schedule: {spec!r}")
+    hour, minute = (int(v) for v in parts[0].split(':'))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid schedule time: {spec!r}")
+    return weekday, hour, minute
+
+
+def next_run_time(schedule, now, tz=None):
+    """Return the first time strictly after `now` matching the schedule.
+    
+    Schedules are wall-clock times, so the search runs on naive local time
+    and the UTC offset of the chosen day is only resolved at the end: an
+    08:00 schedule stays at 08:00 across DST changes.
+    
+    Args:
+        schedule: (weekday or None, hour, minute) from parse_schedule()
+        now: Aware datetime
+        tz: Time zone of the schedule (defaults to the system local time)
+    
+    Returns:
+        datetime: The next run time, aware
+    """
+    weekday, hour, minute = schedule
+    local_now = now.astimezone(tz).replace(tzinfo=None)
+    candidate = local_now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= local_now:
+        candidate += timedelta(days=1)
+    if weekday is not None:
+        candidate += timedelta(days=(weekday - candidate.weekday()) % 7)
+    return candidate.replace(tzinfo=tz) if tz is not None else candidate.astimezone()
+
+
+def send_weekly_digest():
+    """Send a one-line summary of the coming week's celebrations to TARGET_PHONE_NUMBER."""
+    if not sync_people_cache():
+        print("⚠️ People cache sync failed, using last synced data")
+    start = datetime.now()
+    entries = celebrations_between(get_celebration_calendar(), start, start + timedelta(days=6))
+    print(format_celebrations_report(entries) or "No celebrations this week")
+    
+    # Template parameters cannot contain newlines and are limited to 1024 characters
+    days = []
+    for date, birthdays, anniversaries in entries:
+        names = [p['name'] for p in birthdays] + [f"{c['name']} (aniv.)" for c in anniversaries]
+        days.append(f"{MONTHS_ES[date.month][:3]} {date.day}: {', '.join(names)}")
+    summary = " | ".join(days) or "No celebrations this week"
+    if len(summary) > 1024:
+        summary = summary[:1021] + "..."
+    send_whatsapp_template(template_name=WA_TEMPLATE_NOTIFICATION, parameters=[summary])
+
+
+def run_daemon(tenants=None):
+    """Stay resident and run the configured schedules.
+    
+    Fonts, the decoded template, HTTP connection pools and the people cache
+    stay warm between runs. Times follow the TZ environment variable (as set
+    in docker-compose.yml). SIGTERM/SIGINT stop the loop between jobs.
+    
+    Args:
+        tenants: Run every job for each of these tenants (multi-tenant mode)
+    """
+    from zoneinfo import ZoneInfo
+    
+    tz = None
+    if os.getenv('TZ'):
+        # POSIX allows a leading colon (TZ=:America/New_York)
+        try:
+            tz = ZoneInfo(os.getenv('TZ').lstrip(':'))
+        except (KeyError, ValueError, OSError) as e:
+            logging.error(f"Unknown time zone TZ={os.getenv('TZ')!r} ({e}); using the system local time")
+    jobs = [
+        ("daily card", SCHEDULE_DAILY_CARD, main),
+        ("weekly digest", SCHEDULE_WEEKLY_DIGEST, send_weekly_digest),
+        ("pre-render", SCHEDULE_PRERENDER, lambda: prerender_upcoming_postcards(PRERENDER_DAYS)),
+    ]
+    if tenants:
+        # Pre-rendering already fills every core, so tenants take turns there
+        jobs = [
+            (name, spec, functools.partial(run_for_tenants, tenants, job,
+                                           concurrency=1 if name == "pre-render" else None))
+            for name, spec, job in jobs
+        ]
+    schedules = [(name, parse_schedule(spec), job) for name, spec, job in jobs if spec.strip()]
+    if not schedules:
+        print("❌ Error: No schedules configured")
+        return
+    
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    
+    # Finish sends a previous process left behind before waiting for the schedule
+    if OUTBOX_ENABLED:
+        if tenants:
+            run_for_tenants(tenants, resume_unfinished_run)
+        else:
+            try:
+                resume_unfinished_run()
+            except Exception as e:
+                logging.error(f"Could not resume unfinished sends: {e}")
+    
+    # Load the template up front so the first run is as fast as later ones
+    _warm_render_worker()
+    
+    def _now():
+        return datetime.now().astimezone(tz)
+    
+    pending = {name: next_run_time(schedule, _now(), tz) for name, schedule, _ in schedules}
+    for name, _, _ in schedules:
+        print(f"⏰ Next {name}: {pending[name]:%Y-%m-%d %H:%M %Z}")
+    
+    while not stop.is_set():
+        name, _, job = min(schedules, key=lambda entry: pending[entry[0]])
+        wait = (pending[name] - _now()).total_seconds()
+        if wait > 0:
+            # Wake up at least once a minute so clock changes are noticed
+            stop.wait(min(wait, 60))
+            continue
+        
+        print(f"\n▶ Running {name} ({_now():%Y-%m-%d %H:%M %Z})")
+        try:
+            job()
+        except Exception as e:
+            logging.error(f"Scheduled {name} failed: {e}")
+        schedule = next(entry[1] for entry in schedules if entry[0] == name)
+        pending[name] = next_run_time(schedule, _now(), tz)
+        print(f"⏰ Next {name}: {pending[name]:%Y-%m-%d %H:%M %Z}")
+    
+    print("Daemon stopped")
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send today's celebration postcard via WhatsApp.")
+    parser.add_argument('--full-resync', action='store_true',
+                        help="discard the local people cache and download everything again")
+    parser.add_argument('--upcoming', type=int, metavar='DAYS',
+                        help="print celebrations for the next DAYS days from the local cache and exit")
+    parser.add_argument('--render-range', nargs=2, metavar=('START', 'END'),
+                        type=lambda value: datetime.strptime(value, '%Y-%m-%d'),
+                        help="render postcards for every date from START to END (YYYY-MM-DD) and exit")
+    parser.add_argument('--out-dir', default="output",
+                        help="directory for --render-range postcards (default: output)")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes for --render-range/--prerender (default: RENDER_WORKERS, 2)")
+    parser.add_argument('--prerender', type=int, metavar='DAYS',
+                        help="pre-render postcards for today and the following days, then exit")
+    parser.add_argument('--daemon', action='store_true',
+                        help="stay running and send on the SCHEDULE_* times instead of once")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each stage with cProfile/tracemalloc into PROFILE_DIR (or set BIRTHDAY_PROFILE=1)")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print import/initialization timings, CPU time and peak memory after the run")
+    args = parser.parse_args()
+
+    if args.profile or PROFILE_ENABLED:
+        enable_profiling()
+
+    tenants = None
+    if TENANTS_CONFIG:
+        try:
+            tenants = load_tenants(TENANTS_CONFIG)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: Invalid TENANTS_CONFIG {TENANTS_CONFIG}: {e}")
+            raise SystemExit(1)
+        print(f"✓ Loaded {len(tenants)} tenant(s): {', '.join(t.name for t in tenants)}")
+
+    if args.upcoming is not None or args.render_range or args.prerender:
+        def _utility_modes():
+            synced = sync_people_cache(full_resync=args.full_resync)
+            if not synced:
+                print("⚠️ People cache sync failed, using last synced data")
+            ok = True
+            if args.upcoming is not None:
+                start = datetime.now()
+                entries = celebrations_between(get_celebration_calendar(), start, start + timedelta(days=args.upcoming - 1))
+                print(format_celebrations_report(entries) or "No celebrations in this period")
+                # The report may be stale or empty, so scripts must not trust it
+                ok = synced
+            if args.render_range:
+                out_dir = os.path.join(args.out_dir, _current_tenant.get().name) if tenants else args.out_dir
+                ok = not render_postcards_for_range(*args.render_range, out_dir=out_dir, workers=args.workers) and ok
+            if args.prerender:
+                ok = not prerender_upcoming_postcards(args.prerender, workers=args.workers) and ok
+            return ok
+        
+        if tenants:
+            results = run_for_tenants(tenants, _utility_modes, concurrency=1)
+            ok = all(result is True for result in results.values())
+        else:
+            ok = _utility_modes()
+        raise SystemExit(0 if ok else 1)
+
     required_vars = ['PC_APP_ID', 'PC_SECRET', 'WHATSAPP_API_TOKEN', 'WHATSAPP_PHONE_NUMBER_ID', 'TARGET_PHONE_NUMBER']
-    missing = [v for v in required_vars if not os.getenv(v)]
+    missing = [v for v in required_vars if not os.getenv(v)] if not tenants else []
     if missing:
         print(f"❌ Error: Missing required environment variables: {', '.join(missing)}")
         print("   Please ensure all variables are set in your .env file.")
         print("   See .env.example for the required format.")
+    elif args.daemon:
+        if tenants:
+            run_for_tenants(tenants, check_cache_db)
+        else:
+            check_cache_db()
+        run_daemon(tenants)
+    elif tenants:
+        run_for_tenants(tenants, check_cache_db)
+        run_for_tenants(tenants, lambda: main(full_resync=args.full_resync))
     else:
-        main()
\ No newline at end of file
+        check_cache_db()
+        main(full_resync=args.full_resync)
+        if args.startup_report:
+            print_startup_report()
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""Local HTTP stand-ins for Planning Center and the WhatsApp Graph API.
+
+Serves a synthetic congregation over real HTTP with JSON:API pagination,
+ETag revalidation, configurable latency, Planning Center-style rate limiting (429 with
+Retry-After and X-PCO-API-Request-Rate-* headers) and random error
+injection, so the whole pipeline can be load-tested without touching
+production. Point Birthday.py at it with:
+
+    PC_BASE_URL=http://127.0.0.1:8080/people/v2
+    WHATSAPP_GRAPH_URL=http://127.0.0.1:8080/v21.0
+
+Usage:
+    python benchmarks/fake_servers.py --people 10000 --latency-ms 80 --error-rate 0.02
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from synthetic import PlanningCenterStandIn, generate_congregation
+
+
+class RateLimiter:
+    """Fixed-window limiter mirroring Planning Center's request/period limits."""
+
+    def __init__(self, limit, period):
+        self.limit = limit
+        self.period = period
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._count = 0
+
+    def hit(self):
+        """Count a request; returns (allowed, used, seconds until the window resets)."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.period:
+                self._window_start = now
+                self._count = 0
+            self._count += 1
+            reset_in = self.period - (now - self._window_start)
+            return self._count <= self.limit, min(self._count, self.limit), reset_in
+
+
+class FakeServerStats:
+    """Thread-safe count of responses by status code and of bytes sent."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.bytes_sent = 0
+
+    def add(self, key, size=0):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+            self.bytes_sent += size
+
+    @property
+    def request_count(self):
+        return sum(self.counts.values())
+
+
+def make_handler(stand_in, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, limiter=None, stats=None):
+    """Build a request handler class bound to a stand-in and fault settings."""
+    stats = stats or FakeServerStats()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, status, body, headers=None):
+            content = json.dumps(body).encode("utf-8")
+            stats.add(status, len(content))
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, str(value))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            
+            delay = latency_ms + random.uniform(0, jitter_ms)
+            if delay:
+                time.sleep(delay / 1000)
+            
+            headers = {}
+            is_pco = self.path.startswith("/people/v2/")
+            if is_pco and limiter:
+                allowed, used, reset_in = limiter.hit()
+                headers = {
+                    "X-PCO-API-Request-Rate-Limit": limiter.limit,
+                    "X-PCO-API-Request-Rate-Period": limiter.period,
+                    "X-PCO-API-Request-Rate-Count": used,
+                }
+                if not allowed:
+                    headers["Retry-After"] = max(1, int(reset_in + 0.999))
+                    return self._respond(429, {"errors": [{"code": "429", "detail": "Rate limit exceeded"}]}, headers)
+            
+            if error_rate and random.random() < error_rate:
+                status = random.choice([500, 502, 503])
+                return self._respond(status, {"errors": [{"detail": "Injected failure"}]}, headers)
+            
+            url = f"http://{self.headers.get('Host')}{self.path}"
+            status, payload = stand_in.handle(self.command, url, body)
+            if is_pco and self.command == "GET" and status == 200:
+                # Content hash as the ETag so clients can revalidate with If-None-Match
+                headers["ETag"] = '"%s"' % hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+                if self.headers.get("If-None-Match") == headers["ETag"]:
+                    stats.add(304, 0)
+                    self.send_response(304)
+                    for key, value in headers.items():
+                        self.send_header(key, str(value))
+                    self.end_headers()
+                    return
+            self._respond(status, payload, headers)
+
+        do_GET = _handle
+        do_POST = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host="127.0.0.1", port=8080, people=None, **fault_settings):
+    """Start the fake server in a background thread; returns the server (call shutdown() to stop)."""
+    stand_in = PlanningCenterStandIn(people if people is not None else generate_congregation(1000))
+    stats = FakeServerStats()
+    server = ThreadingHTTPServer((host, port), make_handler(stand_in, stats=stats, **fault_settings))
+    server.daemon_threads = True
+    server.stand_in = stand_in
+    server.stats = stats
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Planning Center / WhatsApp stand-in server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--people", type=int, default=1000, help="congregation size (default: 1000)")
+    parser.add_argument("--birthday-density", type=float, default=0.003)
+    parser.add_argument("--anniversary-density", type=float, default=0.003)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests failing with 500/502/503 (default: 0)")
+    parser.add_argument("--rate-limit", type=int, default=100,
+                        help="Planning Center requests allowed per period, 0 to disable (default: 100)")
+    parser.add_argument("--rate-period", type=int, default=20, help="rate-limit period in seconds (default: 20)")
+    args = parser.parse_args()
+    
+    people = generate_congregation(args.people, args.birthday_density, args.anniversary_density)
+    limiter = RateLimiter(args.rate_limit, args.rate_period) if args.rate_limit else None
+    server = serve(args.host, args.port, people, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                   error_rate=args.error_rate, limiter=limiter)
+    print(f"Serving {args.people} synthetic people on http://{args.host}:{args.port}")
+    print(f"  PC_BASE_URL=http://{args.host}:{args.port}/people/v2")
+    print(f"  WHATSAPP_GRAPH_URL=http://{args.host}:{args.port}/v21.0")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"Responses by status: {server.stats.counts}")
+
+
+if __name__ == "__main__":
+    main()
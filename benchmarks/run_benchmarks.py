@@ -0,0 +1,205 @@
+"""Offline benchmarks for Birthday.py against synthetic congregations.
+
+Times the Planning Center fetchers, postcard layout and the full main()
+pipeline against the in-process stand-in from synthetic.py, reporting wall
+time, HTTP request counts, bytes received and peak Python memory. Results are
+saved as JSON per commit so runs can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # 1k, 10k and 100k people
+    python benchmarks/run_benchmarks.py --sizes 1000 --repeat 5
+    python benchmarks/run_benchmarks.py --http             # through fake_servers.py over HTTP
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+WORK_DIR = tempfile.mkdtemp(prefix="birthday-bench-")
+
+# Keep the benchmark away from real credentials and the real cache
+os.environ.update({
+    "PC_APP_ID": "bench", "PC_SECRET": "bench",
+    "WHATSAPP_API_TOKEN": "bench", "WHATSAPP_PHONE_NUMBER_ID": "1000",
+    "TARGET_PHONE_NUMBER": "15550000000",
+    "CACHE_DB_PATH": os.path.join(WORK_DIR, "cache.db"),
+    "PRERENDER_DIR": os.path.join(WORK_DIR, "prerender"),
+    "WA_MEDIA_CACHE_DAYS": "0",
+    "HTTP_CACHE_ENABLED": "false",
+    "OUTBOX_ENABLED": "false",
+})
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+import Birthday  # noqa: E402
+import fake_servers  # noqa: E402
+from synthetic import PlanningCenterStandIn, StandInAdapter, generate_congregation  # noqa: E402
+
+_http_server = None
+
+
+def _install_stand_in(people, over_http=False):
+    """Point Birthday.py at a fresh stand-in; returns an object with request/byte counts."""
+    global _http_server
+    # The stand-in has no rate limit; pacing would only measure sleeps
+    Birthday._rate_limiters.clear()
+    
+    if over_http:
+        # Serve through the real HTTP stack (fake_servers.py) on an ephemeral port
+        if _http_server:
+            _http_server.shutdown()
+            _http_server.server_close()
+        _http_server = fake_servers.serve(port=0, people=people)
+        base = f"http://127.0.0.1:{_http_server.server_address[1]}"
+        Birthday.PC_BASE_URL = f"{base}/people/v2"
+        Birthday.WHATSAPP_GRAPH_URL = f"{base}/v21.0"
+        return _HttpCounters(_http_server.stats)
+    
+    adapter = StandInAdapter(PlanningCenterStandIn(people, Birthday.PC_ANNIVERSARY_LIST_ID))
+    session = Birthday.get_http_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
+
+
+class _HttpCounters:
+    def __init__(self, stats):
+        self.stats = stats
+
+    @property
+    def request_count(self):
+        return self.stats.request_count
+
+    @property
+    def bytes_received(self):
+        return self.stats.bytes_sent
+
+
+def _ensure_template():
+    """Use the real template when present, otherwise a blank one of the same size."""
+    template_path = os.path.join(Birthday.TEMPLATE_DIR, "felicidades.png")
+    if os.path.exists(template_path):
+        return
+    Birthday._import_pil()
+    Birthday.TEMPLATE_DIR = os.path.join(WORK_DIR, "postcard")
+    os.makedirs(Birthday.TEMPLATE_DIR, exist_ok=True)
+    Birthday.Image.new("RGB", (1080, 1350), "#faf6ee").save(os.path.join(Birthday.TEMPLATE_DIR, "felicidades.png"))
+
+
+def _measure(func, people, repeat, over_http=False):
+    """Run func `repeat` times against a fresh stand-in; returns the stats dict."""
+    timings = []
+    peak = 0
+    adapter = None
+    for _ in range(repeat):
+        adapter = _install_stand_in(people, over_http)
+        tracemalloc.start()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {
+        "wall_ms": round(statistics.median(timings) * 1000, 2),
+        "min_ms": round(min(timings) * 1000, 2),
+        "requests": adapter.request_count,
+        "bytes": adapter.bytes_received,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def _overlay(names):
+    text = Birthday.build_postcard_text([{"name": n} for n in names], [])
+    template_path = os.path.join(Birthday.TEMPLATE_DIR, "felicidades.png")
+    Birthday.render_postcard_pages(template_path, text)
+
+
+def run(sizes, repeat, birthday_density, anniversary_density, over_http=False):
+    _ensure_template()
+    results = []
+    for size in sizes:
+        people = generate_congregation(size, birthday_density, anniversary_density)
+        today = datetime.now().strftime("%m-%d")
+        celebrants = [f"{p[1]} {p[2]}" for p in people if p[3].endswith(today)]
+        
+        cases = [
+            ("get_birthdays_today", lambda: Birthday.get_birthdays_today(use_cache=False)),
+            ("get_anniversaries_today", lambda: Birthday.get_anniversaries_today(use_cache=False)),
+            ("render_postcard_pages", lambda: _overlay(celebrants)),
+            ("main", Birthday.main),
+        ]
+        for name, func in cases:
+            stats = _measure(func, people, repeat, over_http)
+            results.append(dict(benchmark=name, people=size, **stats))
+            print(f"{name:<26} {size:>7}  {stats['wall_ms']:>10.1f} ms  {stats['requests']:>5} req"
+                  f"  {stats['bytes'] / 1024:>9.0f} KB  {stats['peak_kb']:>9.0f} KB peak")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path):
+    """Print the change in wall time and requests against a saved run."""
+    with open(baseline_path) as f:
+        baseline = {(r["benchmark"], r["people"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        base = baseline.get((result["benchmark"], result["people"]))
+        if not base:
+            continue
+        change = (result["wall_ms"] - base["wall_ms"]) / base["wall_ms"] * 100 if base["wall_ms"] else 0.0
+        print(f"{result['benchmark']:<26} {result['people']:>7}  {change:>+8.1f}% time"
+              f"  {result['requests'] - base['requests']:>+5} req")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="congregation sizes to benchmark (default: 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, median reported (default: 3)")
+    parser.add_argument("--birthday-density", type=float, default=0.003,
+                        help="share of people with a birthday on the benchmark day (default: 0.003)")
+    parser.add_argument("--anniversary-density", type=float, default=0.003,
+                        help="share of couples with an anniversary on the benchmark day (default: 0.003)")
+    parser.add_argument("--http", action="store_true",
+                        help="go through real HTTP to benchmarks/fake_servers.py instead of the in-process adapter")
+    parser.add_argument("--compare", metavar="RESULTS_JSON", help="compare against a previously saved run")
+    parser.add_argument("--no-save", action="store_true", help="do not write the results file")
+    args = parser.parse_args()
+    
+    results = run(args.sizes, args.repeat, args.birthday_density, args.anniversary_density, args.http)
+    
+    if not args.no_save:
+        commit = _git_commit()
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+        with open(path, "w") as f:
+            json.dump({"commit": commit, "timestamp": datetime.now().isoformat(timespec="seconds"),
+                       "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nSaved {path}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Synthetic Planning Center congregations and an offline stand-in for the APIs.
+
+The stand-in answers the endpoints Birthday.py uses (Planning Center People
+and the WhatsApp Graph API media/messages endpoints) from a generated
+dataset, so the pipeline can be benchmarked without network access.
+"""
+
+import io
+import json
+import random
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+FIRST_NAMES = [
+    "Ana", "Luis", "María", "José", "Carmen", "Juan", "Rosa", "Carlos", "Elena", "Pedro",
+    "Lucía", "Miguel", "Sofía", "Jorge", "Isabel", "Andrés", "Paula", "Diego", "Teresa", "Raúl",
+]
+LAST_NAMES = [
+    "García", "Rodríguez", "Martínez", "Hernández", "López", "González", "Pérez", "Sánchez",
+    "Ramírez", "Torres", "Flores", "Rivera", "Gómez", "Díaz", "Cruz", "Morales", "Giron",
+]
+
+
+def generate_congregation(size, birthday_density=0.003, anniversary_density=0.003,
+                          married_share=0.4, household_size=3, date=None, seed=1):
+    """Generate a synthetic congregation.
+    
+    Args:
+        size: Number of people
+        birthday_density: Share of people whose birthday falls on `date`
+        anniversary_density: Share of married people whose anniversary falls on `date`
+        married_share: Share of people who are part of a married couple (and so
+            on the anniversary list)
+        household_size: Average number of people per household
+        date: The benchmark's "today" (defaults to now)
+        seed: Random seed, so runs are comparable
+    
+    Returns:
+        list: People as (id, first_name, last_name, birthdate, anniversary,
+        household_id, updated_at) tuples
+    """
+    rng = random.Random(seed)
+    date = date or datetime.now()
+    year_start = datetime(2001, 1, 1)
+    
+    def _random_day(exclude):
+        while True:
+            day = year_start + timedelta(days=rng.randrange(365))
+            if (day.month, day.day) != (exclude.month, exclude.day):
+                return day
+    
+    people = []
+    person_id = 100000
+    household_id = 500000
+    while len(people) < size:
+        household_id += 1
+        last_name = rng.choice(LAST_NAMES)
+        members = max(1, min(size - len(people), int(rng.expovariate(1 / household_size)) + 1))
+        couple = members >= 2 and rng.random() < married_share * household_size / 2
+        
+        if couple:
+            wedding = date if rng.random() < anniversary_density else _random_day(date)
+            wedding_str = f"{rng.randint(1970, 2020)}-{wedding.month:02d}-{wedding.day:02d}"
+        for index in range(members):
+            person_id += 1
+            born = date if rng.random() < birthday_density else _random_day(date)
+            birthdate = f"{rng.randint(1940, 2015)}-{born.month:02d}-{born.day:02d}"
+            anniversary = wedding_str if couple and index < 2 else None
+            updated_at = f"20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z"
+            people.append((str(person_id), rng.choice(FIRST_NAMES), last_name, birthdate,
+                           anniversary, str(household_id), updated_at))
+    return people
+
+
+class PlanningCenterStandIn:
+    """Serves Planning Center and WhatsApp endpoints from a synthetic congregation.
+    
+    Args:
+        people: Output of generate_congregation()
+        list_id: ID of the anniversary list (everyone with an anniversary)
+    """
+
+    def __init__(self, people, list_id="4700166"):
+        self.people = people
+        self.by_id = {p[0]: p for p in people}
+        self.list_id = str(list_id)
+        self.list_members = [p for p in people if p[4]]
+        self.households = {}
+        for person in people:
+            self.households.setdefault(person[5], []).append(person[0])
+        self.media_count = 0
+        self.message_count = 0
+
+    # -- serialization ---------------------------------------------------------
+
+    def _person(self, person, include_households):
+        resource = {
+            "type": "Person",
+            "id": person[0],
+            "attributes": {
+                "name": f"{person[1]} {person[2]}",
+                "first_name": person[1],
+                "last_name": person[2],
+                "birthdate": person[3],
+                "anniversary": person[4],
+                "updated_at": person[6],
+            },
+            "links": {"self": f"/people/v2/people/{person[0]}"},
+        }
+        if include_households:
+            resource["relationships"] = {"households": {"data": [{"type": "Household", "id": person[5]}]}}
+        return resource
+
+    def _household(self, household_id, include_people):
+        resource = {"type": "Household", "id": household_id, "attributes": {"updated_at": "2020-01-01T00:00:00Z"}}
+        if include_people:
+            resource["relationships"] = {
+                "people": {"data": [{"type": "Person", "id": pid} for pid in self.households[household_id]]}
+            }
+        return resource
+
+    def _page(self, base_url, query, items, serialize):
+        per_page = min(100, int(query.get("per_page", 25)))
+        offset = int(query.get("offset", 0))
+        page = {
+            "data": [serialize(item) for item in items[offset:offset + per_page]],
+            "meta": {"total_count": len(items), "count": min(per_page, max(0, len(items) - offset))},
+            "links": {},
+        }
+        if offset + per_page < len(items):
+            next_query = dict(query, offset=offset + per_page, per_page=per_page)
+            page["links"]["next"] = f"{base_url}?{urlencode(next_query)}"
+        return page
+
+    # -- routing ---------------------------------------------------------------
+
+    def handle(self, method, url, body=None):
+        """Answer a request.
+        
+        Returns:
+            tuple: (status code, JSON-serializable body)
+        """
+        parts = urlsplit(url)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        base_url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        segments = [s for s in parts.path.split("/") if s]
+        includes = set(query.get("include", "").split(","))
+        
+        if method == "POST" and segments and segments[-1] == "media":
+            self.media_count += 1
+            return 200, {"id": f"media-{self.media_count}"}
+        if method == "POST" and segments and segments[-1] == "messages":
+            self.message_count += 1
+            return 200, {"messages": [{"id": f"wamid.{self.message_count}"}]}
+        if method != "GET" or segments[:2] != ["people", "v2"]:
+            return 404, {"errors": [{"detail": "Not found"}]}
+        
+        route = segments[2:]
+        if route == ["people"]:
+            items = self.people
+            month, day = query.get("where[birthdate_month]"), query.get("where[birthdate_day]")
+            if month and day:
+                suffix = f"-{int(month):02d}-{int(day):02d}"
+                items = [p for p in items if p[3].endswith(suffix)]
+            since = query.get("where[updated_at][gte]")
+            if since:
+                items = [p for p in items if p[6] >= since]
+            if query.get("order") == "updated_at":
+                items = sorted(items, key=lambda p: p[6])
+            return 200, self._page(base_url, query, items, lambda p: self._person(p, "households" in includes))
+        if len(route) == 3 and route[0] == "people" and route[2] == "households":
+            person = self.by_id.get(route[1])
+            if not person:
+                return 404, {"errors": [{"detail": "Not found"}]}
+            return 200, {"data": [self._household(person[5], False)]}
+        if route == ["households"]:
+            items = list(self.households)
+            since = query.get("where[updated_at][gte]")
+            if since and since > "2020-01-01T00:00:00Z":
+                items = []
+            return 200, self._page(base_url, query, items, lambda h: self._household(h, "people" in includes))
+        if len(route) == 2 and route[0] == "lists" and route[1] == self.list_id:
+            return 200, {"data": {"type": "List", "id": self.list_id,
+                                  "attributes": {"refreshed_at": "2020-01-01T00:00:00Z"}}}
+        if len(route) == 3 and route[0] == "lists" and route[1] == self.list_id and route[2] == "people":
+            return 200, self._page(base_url, query, self.list_members,
+                                   lambda p: self._person(p, "households" in includes))
+        return 404, {"errors": [{"detail": "Not found"}]}
+
+
+class StandInAdapter(BaseAdapter):
+    """requests transport adapter that answers from a PlanningCenterStandIn in-process.
+    
+    Counts requests and response bytes for the benchmark report.
+    """
+
+    def __init__(self, stand_in):
+        super().__init__()
+        self.stand_in = stand_in
+        self.request_count = 0
+        self.bytes_received = 0
+
+    def send(self, request, **kwargs):
+        status, body = self.stand_in.handle(request.method, request.url, request.body)
+        content = json.dumps(body).encode("utf-8")
+        self.request_count += 1
+        self.bytes_received += len(content)
+        
+        response = requests.Response()
+        response.status_code = status
+        response.headers["Content-Type"] = "application/json"
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def close(self):
+        pass